@@ -1,5 +1,6 @@
 import asyncio
 from logging.config import fileConfig
+import sqlalchemy as sa
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
@@ -8,6 +9,8 @@ from alembic import context
 from app.core.config import settings
 from app.db.base_class import Base
 from app.models.summary import Summary  # Import all models
+from app.models.summary_job import SummaryJob
+from app.models.summary_keyword import SummaryKeyword
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -16,7 +19,15 @@ config = context.config
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Migrate the application database unless the caller set another URL
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+
+# Revision matching the tables that Base.metadata.create_all made before the
+# application had migrations
+BASELINE_REVISION = "0001"
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -40,7 +51,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = settings.database_url
+    url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -52,10 +63,18 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def stamp_unversioned_database(connection: Connection) -> None:
+    """Mark a database created without migrations as being at the baseline revision"""
+    tables = sa.inspect(connection).get_table_names()
+    if "summaries" in tables and "alembic_version" not in tables:
+        context.get_context().stamp(context.script, BASELINE_REVISION)
+
+
 def do_run_migrations(connection: Connection) -> None:
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
+        stamp_unversioned_database(connection)
         context.run_migrations()
 
 
@@ -0,0 +1,41 @@
+"""Create the summary_jobs table of the durable job queue
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("summary_id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("state", sa.String(16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lease_owner", sa.String(32)),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_summary_jobs_id", "summary_jobs", ["id"])
+    op.create_index("ix_summary_jobs_summary_id", "summary_jobs", ["summary_id"])
+    op.create_index("ix_summary_jobs_state", "summary_jobs", ["state"])
+    op.create_index("ix_summary_jobs_run_after", "summary_jobs", ["run_after"])
+
+
+def downgrade() -> None:
+    op.drop_table("summary_jobs")
@@ -0,0 +1,70 @@
+"""Create the summary_keywords table indexing the keywords of each summary
+
+Indexes the keywords of the summaries already stored.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+summaries = sa.table(
+    "summaries",
+    sa.column("id", sa.Integer()),
+    sa.column("key_top", sa.Text()),
+    sa.column("keywords", sa.Text()),
+)
+summary_keywords = sa.table(
+    "summary_keywords",
+    sa.column("summary_id", sa.Integer()),
+    sa.column("keyword", sa.Text()),
+)
+
+
+def split_keywords(key_top, keywords):
+    """Normalized, deduplicated keywords of a summary, as app.crud.crud_summaries.split_keywords"""
+    normalized = (k.strip().lower() for k in [key_top or ""] + (keywords or "").split(","))
+    return list(dict.fromkeys(k for k in normalized if k))
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_keywords",
+        sa.Column("summary_id", sa.Integer(), sa.ForeignKey("summaries.id", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("keyword", sa.Text(), primary_key=True),
+    )
+    op.create_index("ix_summary_keywords_keyword_summary_id", "summary_keywords", ["keyword", "summary_id"])
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(summaries.c.id, summaries.c.key_top, summaries.c.keywords)
+            .where(summaries.c.id > last_id).order_by(summaries.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        keyword_rows = [
+            {"summary_id": row.id, "keyword": keyword}
+            for row in rows
+            for keyword in split_keywords(row.key_top, row.keywords)
+        ]
+        if keyword_rows:
+            bind.execute(summary_keywords.insert(), keyword_rows)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_table("summary_keywords")
@@ -0,0 +1,32 @@
+"""Add the full-text index of summaries (FTS5 on SQLite, tsvector on Postgres)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.fulltext import SQLITE_FTS_TABLE, ensure_fulltext_index
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Also indexes the rows already stored
+    ensure_fulltext_index(op.get_bind())
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("summaries_fts_insert", "summaries_fts_delete", "summaries_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_summaries_search_vector")
+        op.execute("ALTER TABLE summaries DROP COLUMN IF EXISTS search_vector")
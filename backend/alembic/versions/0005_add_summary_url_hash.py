@@ -0,0 +1,69 @@
+"""Add the unique normalized URL hash and the generation time of summaries
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.urls import url_hash
+from app.db.fulltext import ensure_fulltext_index
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+summaries = sa.table("summaries", sa.column("id", sa.Integer), sa.column("url", sa.Text),
+                     sa.column("url_hash", sa.String), sa.column("created_at", sa.DateTime),
+                     sa.column("updated_at", sa.DateTime), sa.column("summarized_at", sa.DateTime))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column("summaries", sa.Column("url_hash", sa.String(64), nullable=True))
+    op.add_column("summaries", sa.Column("summarized_at", sa.DateTime(timezone=True)))
+    # Best guess for existing rows: summaries were last written when generated
+    bind.execute(summaries.update().values(
+        summarized_at=sa.func.coalesce(summaries.c.updated_at, summaries.c.created_at)
+    ))
+
+    # Hash every URL, newest rows first so that the most recent summary of a URL is the one kept
+    seen, duplicates, updates = set(), [], []
+    for row_id, url in bind.execute(sa.select(summaries.c.id, summaries.c.url).order_by(summaries.c.id.desc())):
+        key = url_hash(url)
+        if key in seen:
+            duplicates.append(row_id)
+            continue
+        seen.add(key)
+        updates.append({"row_id": row_id, "hash": key})
+    update = summaries.update().where(summaries.c.id == sa.bindparam("row_id")).values(url_hash=sa.bindparam("hash"))
+    for start in range(0, len(updates), BATCH_SIZE):
+        bind.execute(update, updates[start:start + BATCH_SIZE])
+
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        ids = duplicates[start:start + BATCH_SIZE]
+        # Not left to ON DELETE CASCADE: SQLite does not enforce foreign keys by default
+        for table in ("summary_keywords", "summary_jobs"):
+            dependent = sa.table(table, sa.column("summary_id", sa.Integer))
+            bind.execute(dependent.delete().where(dependent.c.summary_id.in_(ids)))
+        bind.execute(summaries.delete().where(summaries.c.id.in_(ids)))
+
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.alter_column("url_hash", existing_type=sa.String(64), nullable=False)
+        batch_op.create_index("ix_summaries_url_hash", ["url_hash"], unique=True)
+    # Batch mode recreates the table on SQLite, which drops the full-text index triggers
+    ensure_fulltext_index(bind)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_index("ix_summaries_url_hash")
+        batch_op.drop_column("url_hash")
+        batch_op.drop_column("summarized_at")
+    ensure_fulltext_index(op.get_bind())
@@ -0,0 +1,38 @@
+"""Add the requested summarizer engine and length to summary jobs and summaries
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.fulltext import ensure_fulltext_index
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("summary_jobs") as batch_op:
+        batch_op.add_column(sa.Column("algorithm", sa.String(64), nullable=False, server_default="auto"))
+        batch_op.add_column(sa.Column("n_sents", sa.Integer(), nullable=False, server_default="5"))
+    # Options of the stored summaries are unknown: left NULL, they are regenerated when requested
+    op.add_column("summaries", sa.Column("algorithm", sa.String(64)))
+    op.add_column("summaries", sa.Column("n_sents", sa.Integer()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_column("n_sents")
+        batch_op.drop_column("algorithm")
+    # Batch mode rebuilds the table on SQLite, dropping the triggers of the full-text index
+    ensure_fulltext_index(op.get_bind())
+    with op.batch_alter_table("summary_jobs") as batch_op:
+        batch_op.drop_column("n_sents")
+        batch_op.drop_column("algorithm")
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from app.core.memory import process_memory
+from app.core.config import settings
+from app.core.worker_pool import summarizer_pool, classifier_pool
 
 router = APIRouter()
 
@@ -6,4 +10,27 @@ router = APIRouter()
 @router.get("/ping")
 async def ping():
     """Health check endpoint"""
-    return {"ping": "pong!"}
\ No newline at end of file
+    return {"ping": "pong!"}
+
+
+@router.get("/health")
+async def health(response: Response):
+    """Readiness check: 503 until the summarization models are loaded, or if loading them failed.
+
+    The classifier is waited for only if it is loaded at start (warm_up_classifier).
+    """
+    pools = [summarizer_pool, classifier_pool] if settings.warm_up_classifier else [summarizer_pool]
+    for pool in pools:
+        if pool.warm_up_error is not None:
+            response.status_code = 503
+            return {"status": "failed", "detail": pool.warm_up_error}
+    if not all(pool.ready for pool in pools):
+        response.status_code = 503
+        return {"status": "warming up"}
+    return {"status": "ready"}
+
+
+@router.get("/health/memory")
+async def memory():
+    """Memory usage of the worker process serving the request, in bytes"""
+    return process_memory()
\ No newline at end of file
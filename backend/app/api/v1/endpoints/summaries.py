@@ -1,67 +1,205 @@
+import codecs
+import json
 import logging
-from typing import List
-from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Path, Depends
+from typing import List, Literal, Optional
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Path, Query, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.crud.crud_summaries import crud_summary
+from app.crud.crud_summary_jobs import crud_summary_job
 from app.schemas.summary_schema import (
     Summary,
     SummaryCreate,
+    SummaryBulkCreate,
+    SummarizerOptions,
     SummaryUpdate,
+    SummaryFields,
     SummaryFromTextCreate,
-    SummaryFromTextResponse
+    SummaryFromTextResponse,
+    SummaryFromStreamResponse,
+    SummarizerEngineInfo,
+    SummariesFromTextsCreate,
+    SummariesFromTextsResponse
 )
-from app.core.summarizer import generate_summary_from_text, generate_summary_from_url, generate_keywords
+from app.core.summarizer import generate_summary_from_text, generate_summaries_from_texts, get_sentence_terms
+from app.core.engines import list_engines
+from app.core.stream_summarizer import StreamingSummarizer, split_complete_text
+from app.core.hierarchical_summarizer import hierarchical_summary
+from app.core.latency_budget import latency_budget
+from app.core.job_queue import job_queue
+from app.core.worker_pool import summarizer_pool, PoolSaturatedError
+from app.core.config import settings
+from app.core.urls import url_hash
+from app.core.single_flight import SingleFlight
+from app.core.summary_cache import make_cache_key
+from app.models.summary import Summary as SummaryModel
+from app.models.summary_job import SummaryJob, JOB_DONE, JOB_FAILED
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Identical texts summarized concurrently share one inference
+text_flights = SingleFlight()
+
 
 @router.post("/text", response_model=SummaryFromTextResponse, status_code=201)
 async def create_summary_from_text(
     payload: SummaryFromTextCreate
 ) -> SummaryFromTextResponse:
     """Generate summary from plain text without storing in database"""
+    algorithm = payload.algorithm
+    budget_ms = payload.budget_ms or settings.text_latency_budget_ms
+    key = make_cache_key(payload.text, payload.n_sents, f"{algorithm}:{budget_ms}")
     try:
-        total_summary = generate_summary_from_text(payload.text)
-        response = {"text": payload.text, "summary": total_summary}
+        if budget_ms:
+            # Degrade to cheaper algorithms rather than miss the deadline
+            total_summary, tier = await text_flights.do(
+                key, latency_budget.summarize, payload.text, payload.n_sents, algorithm, budget_ms / 1000
+            )
+        elif algorithm == "auto":
+            # Long texts are split into sections summarized in parallel
+            total_summary, tier = await text_flights.do(key, hierarchical_summary, payload.text, payload.n_sents)
+        else:
+            total_summary, tier = await text_flights.do(
+                key, summarizer_pool.run, generate_summary_from_text, payload.text, payload.n_sents,
+                algorithm=algorithm
+            )
+        response = {"text": payload.text, "summary": total_summary, "tier": tier}
         logger.info(f"Returning response for text summary")
         return response
+    except PoolSaturatedError as e:
+        logger.warning(f"Rejecting text summary: {e}")
+        raise HTTPException(status_code=429, detail="Summarizer is busy, retry later")
     except Exception as e:
         logger.error(f"Error creating summary from text: {e}")
         raise HTTPException(status_code=500, detail="Error generating summary")
 
 
-async def background_generate_summary(summary_id: int, url: str, db: AsyncSession):
-    """Background task to generate summary and update database"""
+@router.get("/algorithms", response_model=List[SummarizerEngineInfo])
+async def read_algorithms() -> List[SummarizerEngineInfo]:
+    """Summarization algorithms selectable per request, with their cost characteristics"""
+    return [engine.describe() for engine in list_engines()]
+
+
+@router.post("/text/stream", response_model=SummaryFromStreamResponse, status_code=201)
+async def create_summary_from_text_stream(
+    request: Request,
+    n_sents: int = Query(5, gt=0)
+) -> SummaryFromStreamResponse:
+    """Summarize a plain text request body of any size, reading it block by block.
+
+    The body is not held in memory: each block of complete sentences is parsed
+    in the summarizer pool and only running word frequencies and the best
+    candidate sentences are kept. The next block is read once the previous one
+    is parsed, which applies backpressure to the upload.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    summarizer = StreamingSummarizer(n_sents, max_candidates=settings.stream_candidates)
+    buffer = ""
     try:
-        summary_text = generate_summary_from_url(url)
-        keywords = generate_keywords(summary_text)
-        key_top = keywords[0] if keywords else ""
-        keywords_str = ", ".join(keywords[1:]) if len(keywords) > 1 else ""
-        
-        # Get the summary object and update it
-        summary_obj = await crud_summary.get(db, id=summary_id)
-        if summary_obj:
-            update_data = SummaryUpdate(
-                url=summary_obj.url,
-                summary=summary_text,
-                key_top=key_top,
-                keywords=keywords_str
-            )
-            await crud_summary.update(db, db_obj=summary_obj, obj_in=update_data)
-            logger.info(f"Updated summary {summary_id} with generated content")
+        async for piece in request.stream():
+            buffer += decoder.decode(piece)
+            while len(buffer) >= settings.stream_block_chars:
+                block, buffer = split_complete_text(buffer)
+                summarizer.add(*await summarizer_pool.run(get_sentence_terms, block))
+        buffer += decoder.decode(b"", final=True)
+        if buffer.strip():
+            summarizer.add(*await summarizer_pool.run(get_sentence_terms, buffer))
+    except PoolSaturatedError as e:
+        logger.warning(f"Rejecting streamed text summary: {e}")
+        raise HTTPException(status_code=429, detail="Summarizer is busy, retry later")
     except Exception as e:
-        logger.error(f"Error in background summary generation for {summary_id}: {e}")
+        logger.error(f"Error creating summary from streamed text: {e}")
+        raise HTTPException(status_code=500, detail="Error generating summary")
+    logger.info(f"Returning summary of {summarizer.n_sentences} streamed sentences")
+    return {"summary": summarizer.summary(), "sentences": summarizer.n_sentences}
+
+
+@router.post("/text/batch", response_model=SummariesFromTextsResponse, status_code=201)
+async def create_summaries_from_texts(
+    payload: SummariesFromTextsCreate
+) -> SummariesFromTextsResponse:
+    """Generate summaries for a batch of plain texts without storing them, in input order"""
+    try:
+        summaries = await summarizer_pool.run(
+            generate_summaries_from_texts, payload.texts, n_sents=payload.n_sents
+        )
+        logger.info(f"Returning {len(summaries)} text summaries")
+        return {"summaries": summaries}
+    except PoolSaturatedError as e:
+        logger.warning(f"Rejecting text summaries batch: {e}")
+        raise HTTPException(status_code=429, detail="Summarizer is busy, retry later")
+    except Exception as e:
+        logger.error(f"Error creating summaries from texts: {e}")
+        raise HTTPException(status_code=500, detail="Error generating summaries")
+
+
+def is_recent(summary_obj: SummaryModel, options: Optional[SummarizerOptions] = None,
+              max_age: float = 3600.0) -> bool:
+    """Whether a stored summary was created or last regenerated less than max_age seconds ago.
+
+    Edits (PUT, keyword changes) bump updated_at but not summarized_at, so
+    they don't make a stale summary look freshly generated. With ``options``,
+    a summary requested with another algorithm or length is never recent.
+    """
+    if options is not None and (summary_obj.algorithm, summary_obj.n_sents) != (options.algorithm, options.n_sents):
+        return False
+    created_at = summary_obj.summarized_at or summary_obj.created_at
+    if created_at is None:
+        return False
+    if created_at.tzinfo is None:
+        # SQLite returns naive datetimes
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    delta = datetime.now(timezone.utc) - created_at
+    logger.info(f"created at: {created_at}\n delta: {delta.total_seconds()}")
+    return delta.total_seconds() < max_age
+
+
+def summary_event(summary_obj: SummaryModel, status: str, detail: str = None) -> str:
+    """Serialize a bulk job progress event as one NDJSON line"""
+    event = {
+        "id": summary_obj.id,
+        "url": summary_obj.url,
+        "status": status,
+        "summary": summary_obj.summary,
+        "key_top": summary_obj.key_top,
+        "keywords": summary_obj.keywords,
+    }
+    if detail:
+        event["detail"] = detail
+    return json.dumps(event) + "\n"
+
+
+async def stream_bulk_summaries(recent: List[SummaryModel], jobs: List[SummaryJob]):
+    """Yield an event for each recent summary, then one per job as the job queue finishes it"""
+    for summary_obj in recent:
+        yield summary_event(summary_obj, "cached")
+    
+    pending = [job.id for job in jobs]
+    while pending:
+        # Short-lived session per poll so no connection is held while jobs run
+        async with job_queue.session_factory() as db:
+            rows = await crud_summary_job.get_multi_with_summaries(db, ids=pending)
+        for job, summary_obj in rows:
+            if job.state == JOB_DONE:
+                yield summary_event(summary_obj, "done")
+            elif job.state == JOB_FAILED:
+                yield summary_event(summary_obj, "error", detail=job.last_error)
+            else:
+                continue
+            pending.remove(job.id)
+        if pending:
+            await job_queue.wait_for_update(settings.job_poll_interval)
 
 
 @router.post("/", response_model=Summary, status_code=201)
 async def create_summary(
     payload: SummaryCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ) -> Summary:
     """Create a new summary from URL"""
@@ -69,38 +207,92 @@ async def create_summary(
     
     # Check if URL already exists
     existing_summary = await crud_summary.get_by_url(db, url=str(payload.url))
-    if existing_summary:
-        created_at = existing_summary.created_at
-        now = datetime.now(timezone.utc)
-        delta = now - created_at
-        logger.info(f"created at: {created_at}\n now: {now}\n delta: {delta.total_seconds()}")
-        
-        # If summary is less than 1 hour old, return existing
-        if delta.total_seconds() < 3600.0:
-            logger.info(f'Summary already present in DB')
-            return existing_summary
+    # If summary is less than 1 hour old, return existing
+    if existing_summary and is_recent(existing_summary, payload):
+        logger.info(f'Summary already present in DB')
+        return existing_summary
     
-    # Create new summary entry
-    summary = await crud_summary.create(db, obj_in=payload)
-    logger.info(f'New summary id {summary.id} created')
+    if summarizer_pool.saturated:
+        logger.warning('Rejecting URL summary: summarizer pool is saturated')
+        raise HTTPException(status_code=429, detail="Summarizer is busy, retry later")
     
-    # Start background task to generate summary
-    logger.info('Starting AI summary inference ...')
-    background_tasks.add_task(background_generate_summary, summary.id, str(payload.url), db)
+    # Insert the summary unless a concurrent request just did, and queue its
+    # generation in the same transaction. Stale summaries are regenerated in place.
+    summary, created = await crud_summary.get_or_create(db, obj_in=payload, commit=False)
+    if not created and is_recent(summary, payload):
+        logger.info(f'Summary {summary.id} was created by a concurrent request')
+        return summary
+    await job_queue.enqueue(db, summaries=[summary], algorithm=payload.algorithm, n_sents=payload.n_sents)
+    await db.refresh(summary)
+    logger.info(f'Summary id {summary.id} {"created" if created else "refreshed"} and queued for AI summary inference')
     
     return summary
 
 
+@router.post("/bulk", status_code=201)
+async def create_summaries_bulk(
+    payload: SummaryBulkCreate,
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """Create summaries for many URLs, streaming one NDJSON event per URL as it completes"""
+    unique_urls = {}
+    for url in payload.urls:
+        unique_urls.setdefault(url_hash(str(url)), str(url))
+    urls = list(unique_urls.values())
+    logger.info(f'Creating bulk summaries for {len(urls)} urls ...')
+    
+    existing = await crud_summary.get_multi_by_urls(db, urls=urls)
+    recent = [existing[url] for url in urls if url in existing and is_recent(existing[url], payload)]
+    stale = [existing[url] for url in urls if url in existing and not is_recent(existing[url], payload)]
+    missing = [
+        SummaryCreate(url=url, algorithm=payload.algorithm, n_sents=payload.n_sents)
+        for url in urls if url not in existing
+    ]
+    # Upsert: URLs inserted concurrently since the lookup are shared, not duplicated
+    created = (await crud_summary.upsert_multi(db, objs_in=missing, commit=False))[0] if missing else []
+    jobs = await job_queue.enqueue(db, summaries=stale + created, algorithm=payload.algorithm,
+                                   n_sents=payload.n_sents)
+    logger.info(f'{len(recent)} summaries already present, {len(stale)} to refresh, {len(created)} created')
+    
+    return StreamingResponse(
+        stream_bulk_summaries(recent, jobs),
+        status_code=201,
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/keyword/{keyword}/", response_model=List[Summary])
 async def read_summaries_by_keyword(
     keyword: str,
+    response: Response,
+    prefix: bool = False,
+    cursor: Optional[int] = Query(None, gt=0),
+    limit: int = Query(100, gt=0, le=1000),
     db: AsyncSession = Depends(get_db)
 ) -> List[Summary]:
-    """Get summaries by keyword"""
+    """Get summaries by keyword (or keyword prefix), paginated with the X-Next-Cursor header"""
     logger.info(f'Searching for summaries with keyword {keyword}')
-    summaries = await crud_summary.search_by_keyword(db, keyword=keyword)
-    if not summaries:
+    summaries = await crud_summary.search_by_keyword(
+        db, keyword=keyword, prefix=prefix, after_id=cursor, limit=limit
+    )
+    if not summaries and cursor is None:
         raise HTTPException(status_code=404, detail=f"No summaries found with keyword {keyword}")
+    if len(summaries) == limit:
+        response.headers["X-Next-Cursor"] = str(summaries[-1].id)
+    logger.info(f'Found {len(summaries)} summaries')
+    return summaries
+
+
+@router.get("/search/", response_model=List[Summary])
+async def search_summaries(
+    q: str = Query(..., min_length=1, max_length=500),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, gt=0, le=100),
+    db: AsyncSession = Depends(get_db)
+) -> List[Summary]:
+    """Full-text search over stored summaries and their URLs, best matches first"""
+    logger.info(f'Searching summaries for {q}')
+    summaries = await crud_summary.search(db, query=q, skip=skip, limit=limit)
     logger.info(f'Found {len(summaries)} summaries')
     return summaries
 
@@ -119,14 +311,29 @@ async def read_summary(
     return summary
 
 
-@router.get("/", response_model=List[Summary])
+@router.get("/", response_model=List[SummaryFields], response_model_exclude_unset=True)
 async def read_all_summaries(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset, superseded by cursor"),
+    cursor: Optional[int] = Query(None, gt=0),
+    limit: int = Query(100, gt=0, le=1000),
+    order: Literal["asc", "desc"] = Query("asc", description="asc: oldest first, desc: newest first"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,url,key_top"),
     db: AsyncSession = Depends(get_db)
-) -> List[Summary]:
-    """Get all summaries with pagination"""
-    summaries = await crud_summary.get_multi(db, skip=skip, limit=limit)
+) -> List[SummaryFields]:
+    """Get all summaries in creation order, paginated with the X-Next-Cursor header (or skip)"""
+    selected = None
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(selected) - set(SummaryFields.model_fields)
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    summaries = await crud_summary.get_multi(db, skip=skip, cursor=cursor, limit=limit, fields=selected,
+                                             newest_first=order == "desc")
+    if len(summaries) == limit:
+        response.headers["X-Next-Cursor"] = str(summaries[-1]["id"] if selected else summaries[-1].id)
+    if selected:
+        return [{field: row[field] for field in selected} for row in summaries]
     return summaries
 
 
@@ -155,5 +362,9 @@ async def update_summary(
     if not summary:
         raise HTTPException(status_code=404, detail='Summary not found')
     
-    updated_summary = await crud_summary.update(db, db_obj=summary, obj_in=payload)
+    try:
+        updated_summary = await crud_summary.update(db, db_obj=summary, obj_in=payload)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Another summary already has this URL")
     return updated_summary
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +9,11 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     environment: str = "development"
     debug: bool = True
+
+    # Database connection pool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
     
     # CORS settings
     allowed_origins: list[str] = [
@@ -21,7 +26,72 @@ class Settings(BaseSettings):
     
     # External APIs
     hf_token: str = ""
-    
+
+    # Summarizer worker pool (None = one process per core, 0 = threads in the API process)
+    summarizer_workers: Optional[int] = None
+    summarizer_max_pending: int = 64
+    # Modules registering extra summarizer engines (see app.core.engines)
+    summarizer_engine_modules: List[str] = []
+    warm_up_classifier: bool = False
+    # Model loading attempts before the pool is reported failed, and the seconds between them
+    warm_up_attempts: int = 3
+    warm_up_retry_delay: float = 5.0
+    # Load the models at import time in a pre-fork server master (see gunicorn.conf.py)
+    preload_models: bool = False
+
+    # Keyword micro-batching
+    keyword_batch_size: int = 16
+    keyword_batch_wait_ms: int = 50
+    # Seconds without keyword requests after which the classifier is unloaded (None: keep it loaded)
+    classifier_idle_unload_s: Optional[float] = 900
+
+    # spaCy batch processing (nlp.pipe) for the batch text endpoint
+    nlp_batch_size: int = 64
+    nlp_n_process: int = 1
+    # Streaming /text/stream uploads: characters parsed per block and candidate sentences kept
+    stream_block_chars: int = 100_000
+    stream_candidates: int = 256
+    # Texts longer than a section are summarized section by section in parallel
+    hierarchical_section_chars: int = 50_000
+    hierarchical_candidates: int = 32
+    hierarchical_parallelism: Optional[int] = None
+    # Default latency budget of /summaries/text requests (None: no deadline)
+    text_latency_budget_ms: Optional[float] = None
+    # Jobs past their budget left running; beyond that, budgeted requests get the lead sentences
+    text_budget_max_orphans: int = 16
+
+    # Sentence scoring of the extractive summarizer: frequency, tfidf or textrank
+    scoring_method: str = "frequency"
+
+    # Abstractive (map-reduce) summarization
+    abstractive_model: str = "sshleifer/distilbart-cnn-6-6"
+    abstractive_chunk_tokens: int = 512
+    abstractive_summary_tokens: int = 128
+    abstractive_batch_size: int = 4
+    abstractive_threads: int = 0
+
+    # Summary cache (disk layer is enabled by setting a SQLite file path)
+    summary_cache_size: int = 1024
+    summary_cache_path: Optional[str] = None
+    summary_cache_ttl: int = 86400
+    summary_cache_max_entries: int = 100000
+
+    # Article fetching
+    fetch_timeout: float = 10.0
+    fetch_max_bytes: int = 5_000_000
+    fetch_max_connections: int = 100
+    fetch_per_host_limit: int = 4
+    fetch_validator_cache_size: int = 256
+    # Total characters of page HTML kept for conditional GETs, per process
+    fetch_validator_cache_chars: int = 20_000_000
+
+    # Durable URL summary job queue
+    job_workers: int = 4
+    job_max_attempts: int = 3
+    job_retry_backoff: float = 5.0
+    job_poll_interval: float = 1.0
+    job_lease: float = 300.0
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,110 @@
+import importlib
+import logging
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+COST_LOW = "low"
+COST_MEDIUM = "medium"
+COST_HIGH = "high"
+COSTS = (COST_LOW, COST_MEDIUM, COST_HIGH)
+
+
+class SummarizerEngine:
+    """A summarization algorithm with the cost characteristics callers choose it by.
+
+    ``summarize(text, n_sents)`` returns the summary. ``cost`` is a coarse tier
+    (low, medium or high), ``complexity`` how the running time grows with the
+    number of sentences n, and ``chars_per_second`` a rough single-core
+    throughput, usable to estimate the running time of a text. ``summarize``
+    raises on failure: callers then run the ``fallback`` engine, if any.
+    """
+
+    def __init__(self, name: str, summarize: Callable[[str, int], str], cost: str, complexity: str,
+                 chars_per_second: float, description: str = "", fallback: Optional[str] = None):
+        self.name = name
+        self.summarize = summarize
+        self.cost = cost
+        self.complexity = complexity
+        self.chars_per_second = chars_per_second
+        self.description = description
+        self.fallback = fallback
+
+    def estimate_seconds(self, text_length: int) -> float:
+        return text_length / self.chars_per_second
+
+    def record(self, text_length: int, seconds: float, weight: float = 0.2) -> None:
+        """Move the throughput estimate towards a measured run (exponential moving average).
+
+        Estimates live in the process that records them. The worker processes
+        get the API process' ones with each budgeted job (see latency_budget).
+        """
+        if text_length > 0 and seconds > 0:
+            self.chars_per_second += weight * (text_length / seconds - self.chars_per_second)
+
+    def describe(self) -> Dict:
+        return {
+            "name": self.name,
+            "cost": self.cost,
+            "complexity": self.complexity,
+            "chars_per_second": self.chars_per_second,
+            "description": self.description,
+        }
+
+
+ENGINES: Dict[str, SummarizerEngine] = {}
+
+
+def register_engine(engine: SummarizerEngine) -> SummarizerEngine:
+    """Add (or replace) an engine in the registry.
+
+    Summaries run in the summarizer worker processes, so engines must be
+    registered at import time of a module those processes load: the built-in
+    ones are registered by app.core.summarizer, others by the modules listed
+    in the ``summarizer_engine_modules`` setting.
+    """
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: str) -> SummarizerEngine:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown summarization algorithm {name}, expected one of {list(ENGINES)}")
+
+
+def list_engines() -> List[SummarizerEngine]:
+    return list(ENGINES.values())
+
+
+def degradation_ladder(name: str, speeds: Optional[Dict[str, float]] = None) -> List[SummarizerEngine]:
+    """The engine followed by the faster, no costlier ones, slowest (usually the most thorough) first.
+
+    ``speeds`` overrides the chars_per_second estimates of the engines it names.
+    "auto" stands for another engine (see summarizer.resolve_engine), so it is
+    never one of the lower tiers.
+    """
+    speeds = speeds or {}
+
+    def speed(engine: SummarizerEngine) -> float:
+        return speeds.get(engine.name, engine.chars_per_second)
+
+    engine = get_engine(name)
+    faster = [
+        other for other in ENGINES.values()
+        if other.name != "auto" and speed(other) > speed(engine)
+        and COSTS.index(other.cost) <= COSTS.index(engine.cost)
+    ]
+    return [engine] + sorted(faster, key=speed)
+
+
+def load_engine_modules() -> None:
+    """Import the modules registering additional engines"""
+    for module in settings.summarizer_engine_modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.error(f"Could not load summarizer engine module {module}: {e}")
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; SummarizerAI/1.0)"
+
+
+class FetchError(Exception):
+    """Raised when an article cannot be fetched"""
+
+
+class ArticleFetcher:
+    """Fetch article HTML over a shared httpx connection pool.
+
+    Concurrent requests to the same host are limited to ``per_host_limit``.
+    Responses bigger than ``max_bytes`` are aborted. The ETag/Last-Modified
+    validators of the last ``cache_size`` pages, holding at most
+    ``cache_chars`` characters of HTML in total, are kept so that refetching
+    an unchanged page is answered with a 304 and served from memory.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_bytes: int = 5_000_000,
+                 max_connections: int = 100, per_host_limit: int = 4, cache_size: int = 256,
+                 cache_chars: int = 20_000_000):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.cache_size = cache_size
+        self.cache_chars = cache_chars
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Semaphore and number of requests in flight of each host, dropped once idle
+        self._host_limits: Dict[str, List] = {}
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+        self._cached_chars = 0
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            # Its connections belong to another event loop: close them instead of leaking them
+            await self.aclose()
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+            self._loop = loop
+            self._host_limits = {}
+        return self._client
+
+    @asynccontextmanager
+    async def _host_limit(self, url: str) -> AsyncIterator[None]:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = [asyncio.Semaphore(self.per_host_limit), 0]
+        entry = self._host_limits[host]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._host_limits.get(host) is entry:
+                del self._host_limits[host]
+
+    async def fetch(self, url: str) -> str:
+        """Return the HTML of ``url``"""
+        client = await self._get_client()
+        cached = self._validators.get(url)
+        headers = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with self._host_limit(url):
+            try:
+                async with client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        logger.info(f"Article {url} not modified, using cached copy")
+                        self._validators.move_to_end(url)
+                        return cached[2]
+                    response.raise_for_status()
+                    html = await self._read_body(url, response)
+            except httpx.HTTPError as e:
+                raise FetchError(f"Error fetching {url}: {e}") from e
+
+        self._remember(url, response.headers, html)
+        logger.info(f"Fetched {len(html)} characters from {url}")
+        return html
+
+    async def _read_body(self, url: str, response: httpx.Response) -> str:
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise FetchError(f"Article {url} is larger than {self.max_bytes} bytes")
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > self.max_bytes:
+                raise FetchError(f"Article {url} is larger than {self.max_bytes} bytes")
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+    def _remember(self, url: str, headers: httpx.Headers, html: str) -> None:
+        previous = self._validators.pop(url, None)
+        if previous is not None:
+            self._cached_chars -= len(previous[2])
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not (etag or last_modified) or len(html) > self.cache_chars:
+            return
+        self._validators[url] = (etag, last_modified, html)
+        self._cached_chars += len(html)
+        while len(self._validators) > self.cache_size or self._cached_chars > self.cache_chars:
+            _, (_, _, evicted) = self._validators.popitem(last=False)
+            self._cached_chars -= len(evicted)
+
+    async def aclose(self) -> None:
+        if self._client is None:
+            return
+        client, self._client, self._loop = self._client, None, None
+        try:
+            await client.aclose()
+        except Exception as e:
+            # The event loop its connections were opened on may be closed already
+            logger.warning(f"Error closing the HTTP client: {e}")
+
+
+article_fetcher = ArticleFetcher(
+    timeout=settings.fetch_timeout,
+    max_bytes=settings.fetch_max_bytes,
+    max_connections=settings.fetch_max_connections,
+    per_host_limit=settings.fetch_per_host_limit,
+    cache_size=settings.fetch_validator_cache_size,
+    cache_chars=settings.fetch_validator_cache_chars,
+)
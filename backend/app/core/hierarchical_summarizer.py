@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.stream_summarizer import split_complete_text
+from app.core.summarizer import generate_summary_from_text, select_section_candidates, select_sentences
+from app.core.summary_cache import summary_cache, make_cache_key
+from app.core.worker_pool import summarizer_pool
+
+logger = logging.getLogger(__name__)
+
+# Sections in flight across all requests, bound to the event loop that created it
+_section_limit: Optional[asyncio.Semaphore] = None
+_section_limit_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def section_limit() -> asyncio.Semaphore:
+    """The semaphore bounding the sections summarized at once by this process"""
+    global _section_limit, _section_limit_loop
+    loop = asyncio.get_running_loop()
+    if _section_limit is None or _section_limit_loop is not loop:
+        _section_limit = asyncio.Semaphore(settings.hierarchical_parallelism or os.cpu_count() or 1)
+        _section_limit_loop = loop
+    return _section_limit
+
+
+def split_sections(text: str, max_chars: int) -> List[str]:
+    """Split a text into sections of at most max_chars, cutting at sentence ends where possible"""
+    sections = []
+    start = 0
+    while len(text) - start > max_chars:
+        section, _ = split_complete_text(text[start:start + max_chars])
+        sections.append(section)
+        start += len(section)
+    sections.append(text[start:])
+    return sections
+
+
+async def hierarchical_summary(text: str, n_sents: int = 5) -> Tuple[str, str]:
+    """Extractive summary of a long text: select candidates per section in parallel, then select among them.
+
+    Every section is parsed in the summarizer pool, where it keeps its best
+    ``hierarchical_candidates`` sentences under its own word counts. The final
+    pick rescores those candidates against the word counts of the whole text,
+    as the single-pass algorithm does; both use ``settings.scoring_method``.
+    Texts of a single section go through the single-pass pipeline, so short
+    inputs give the same output. Returns the summary and the tier that produced
+    it ("hierarchical:<scoring method>" for sectioned texts).
+    """
+    section_chars = settings.hierarchical_section_chars
+    if len(text) <= section_chars:
+        return await summarizer_pool.run(generate_summary_from_text, text, n_sents)
+
+    candidates_per_section = max(settings.hierarchical_candidates, n_sents)
+    method = settings.scoring_method
+    tier = f"hierarchical:{method}"
+    key = make_cache_key(text, n_sents, f"{tier}:{section_chars}:{candidates_per_section}")
+    # The cache may be backed by SQLite: keep its I/O off the event loop
+    summary = await run_in_threadpool(summary_cache.get, key)
+    if summary is not None:
+        logger.info("Summary cache hit")
+        return summary, tier
+
+    sections = split_sections(text, section_chars)
+
+    async def select(section: str):
+        # Bounded fan-out: at most one section per core in flight across all
+        # requests, so long texts leave pool slots to the other requests
+        async with section_limit():
+            return await summarizer_pool.run(select_section_candidates, section, candidates_per_section, method)
+
+    results = await asyncio.gather(*[select(section) for section in sections])
+    candidates, significant_words = [], Counter()
+    for section_candidates, section_words in results:
+        candidates.extend(section_candidates)
+        significant_words.update(section_words)
+    # Rescoring every candidate is CPU work too: it runs in the pool, not on the event loop
+    selected = await summarizer_pool.run(select_sentences, candidates, dict(significant_words), n_sents, method)
+    summary = ' '.join(sentence for sentence, _ in selected)
+    logger.info(f"Summarized {len(sections)} sections from {len(candidates)} candidate sentences")
+    if summary:
+        await run_in_threadpool(summary_cache.set, key, summary)
+    return summary, tier
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.fetcher import article_fetcher
+from app.core.keyword_batcher import keyword_batcher
+from app.core.single_flight import SingleFlight
+from app.core.summarizer import generate_summary_from_url
+from app.core.urls import url_hash
+from app.core.worker_pool import summarizer_pool
+from app.crud.crud_summaries import crud_summary
+from app.crud.crud_summary_jobs import crud_summary_job
+from app.db.session import AsyncSessionLocal
+from app.models.summary import Summary
+from app.models.summary_job import SummaryJob, JOB_FAILED
+from app.schemas.summary_schema import SummaryUpdate
+
+logger = logging.getLogger(__name__)
+
+# Concurrent jobs for the same URL (e.g. refreshes requested at once) share one download and inference
+url_flights = SingleFlight()
+
+
+async def generate_summary_content(url: str, n_sents: int = 5, algorithm: str = "auto") -> SummaryUpdate:
+    """Fetch the article, summarize it and classify its keywords, once per URL and options in flight"""
+    return await url_flights.do((url_hash(url), n_sents, algorithm), _generate_summary_content, url,
+                                n_sents, algorithm)
+
+
+async def _generate_summary_content(url: str, n_sents: int, algorithm: str) -> SummaryUpdate:
+    html = await article_fetcher.fetch(url)
+    summary_text = await summarizer_pool.run(generate_summary_from_url, url, html, n_sents, algorithm)
+    keywords = await keyword_batcher.classify(summary_text)
+    key_top = keywords[0] if keywords else ""
+    keywords_str = ", ".join(keywords[1:]) if len(keywords) > 1 else ""
+    return SummaryUpdate(summary=summary_text, key_top=key_top, keywords=keywords_str)
+
+
+class JobQueue:
+    """Durable queue of URL summary jobs stored in the ``summary_jobs`` table.
+
+    ``workers`` coroutines claim due jobs from the table, generate the summary
+    and write it back. Failed jobs are retried with exponential backoff up to
+    their ``max_attempts``. Jobs left running by a crashed process are
+    reclaimed once their ``lease`` expires, so nothing queued is lost on restart.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker = AsyncSessionLocal, workers: int = 4,
+                 max_attempts: int = 3, retry_backoff: float = 5.0, poll_interval: float = 1.0,
+                 lease: float = 300.0):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._tasks: List[asyncio.Task] = []
+        self._new_jobs: Optional[asyncio.Event] = None
+        self._updated: Optional[asyncio.Condition] = None
+
+    async def enqueue(self, db: AsyncSession, *, summaries: List[Summary], algorithm: str = "auto",
+                      n_sents: int = 5) -> List[SummaryJob]:
+        """Queue summaries for generation, committing them in the same transaction"""
+        jobs = await crud_summary_job.enqueue(db, summaries=summaries, max_attempts=self.max_attempts,
+                                              algorithm=algorithm, n_sents=n_sents)
+        if self._new_jobs is not None:
+            self._new_jobs.set()
+        logger.info(f"Queued {len(jobs)} summary jobs")
+        return jobs
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._new_jobs = asyncio.Event()
+        self._updated = asyncio.Condition()
+        self._tasks = [asyncio.ensure_future(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._new_jobs = None
+        self._updated = None
+        logger.info("Job queue stopped")
+
+    async def wait_for_update(self, timeout: float) -> None:
+        """Wait until a job finishes in this process, or at most timeout seconds"""
+        if self._updated is None:
+            await asyncio.sleep(timeout)
+            return
+        async with self._updated:
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_pending(self) -> int:
+        """Process due jobs until none is left and return how many were run"""
+        count = 0
+        while await self._run_next():
+            count += 1
+        return count
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            try:
+                if await self._run_next():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {n} error: {e}")
+            self._new_jobs.clear()
+            try:
+                await asyncio.wait_for(self._new_jobs.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_next(self) -> bool:
+        async with self.session_factory() as db:
+            job = await crud_summary_job.claim_next(db, lease=self.lease)
+        if job is None:
+            return False
+        if job.attempts > job.max_attempts:
+            # Lease of the last attempt expired: the process running it died
+            async with self.session_factory() as db:
+                await crud_summary_job.mark_failed(db, job=job, error="Job lease expired", retry_delay=0)
+            await self._notify()
+            return True
+
+        logger.info(f"Running job {job.id} for summary {job.summary_id} (attempt {job.attempts})")
+        try:
+            update_data = await generate_summary_content(job.url, n_sents=job.n_sents, algorithm=job.algorithm)
+        except Exception as e:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            async with self.session_factory() as db:
+                state = await crud_summary_job.mark_failed(db, job=job, error=str(e), retry_delay=delay)
+            if state is None:
+                logger.warning(f"Job {job.id} failed after its lease was taken over, leaving it: {e}")
+            else:
+                log = logger.error if state == JOB_FAILED else logger.warning
+                log(f"Job {job.id} for summary {job.summary_id} failed ({state}): {e}")
+        else:
+            async with self.session_factory() as db:
+                # The summary is written in the same transaction, only if the job is still ours
+                if not await crud_summary_job.mark_done(db, job=job, commit=False):
+                    logger.warning(f"Job {job.id} finished after its lease was taken over, discarding its result")
+                    return True
+                summary_obj = await crud_summary.get(db, id=job.summary_id)
+                if summary_obj:
+                    # A later request may have queued other options meanwhile: record the ones used here
+                    summary_obj.algorithm, summary_obj.n_sents = job.algorithm, job.n_sents
+                    await crud_summary.update(db, db_obj=summary_obj, obj_in=update_data, summarized=True)
+                else:
+                    await db.commit()
+            logger.info(f"Updated summary {job.summary_id} with generated content")
+        await self._notify()
+        return True
+
+    async def _notify(self) -> None:
+        if self._updated is not None:
+            async with self._updated:
+                self._updated.notify_all()
+
+
+job_queue = JobQueue(
+    workers=settings.job_workers,
+    max_attempts=settings.job_max_attempts,
+    retry_backoff=settings.job_retry_backoff,
+    poll_interval=settings.job_poll_interval,
+    lease=settings.job_lease,
+)
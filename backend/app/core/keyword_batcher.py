@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.summarizer import generate_keywords_batch, unload_classifier
+from app.core.worker_pool import classifier_pool
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordBatcher:
+    """Collect keyword requests for a short window and classify them together.
+
+    Callers await ``classify``. Pending summaries are flushed as one batch to
+    ``generate_keywords_batch`` when ``max_batch_size`` summaries are queued
+    or ``max_wait`` seconds after the first one arrived, whichever comes first.
+    Batches run in the classifier pool, the only one loading the classifier.
+    After ``idle_unload`` seconds without a batch the classifier is unloaded
+    from that pool to free its memory; the next batch loads it again.
+    """
+
+    def __init__(self, max_batch_size: int = 16, max_wait: float = 0.05, idle_unload: Optional[float] = None):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.idle_unload = idle_unload
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._unload_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def classify(self, summary: str) -> List[str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((summary, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._spawn(self._run(batch))
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        summaries = [summary for summary, _ in batch]
+        logger.info(f"Classifying keywords for a batch of {len(summaries)} summaries")
+        if self._unload_timer is not None:
+            self._unload_timer.cancel()
+            self._unload_timer = None
+        try:
+            results = await classifier_pool.run(
+                generate_keywords_batch, summaries, batch_size=settings.keyword_batch_size
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            if self.idle_unload is not None and len(self._tasks) <= 1:
+                # Last batch in flight: unload once no other one follows in time
+                if self._unload_timer is not None:
+                    self._unload_timer.cancel()
+                self._unload_timer = asyncio.get_running_loop().call_later(self.idle_unload, self._unload)
+        for (_, future), keywords in zip(batch, results):
+            if not future.done():
+                future.set_result(keywords)
+
+    def _unload(self) -> None:
+        self._unload_timer = None
+        if not self._pending and not self._tasks:
+            self._spawn(self._run_unload())
+
+    async def _run_unload(self) -> None:
+        try:
+            await classifier_pool.run(unload_classifier)
+            logger.info(f"Classifier unloaded after {self.idle_unload} s without keyword requests")
+        except Exception as e:
+            logger.warning(f"Could not unload the classifier: {e}")
+
+
+keyword_batcher = KeywordBatcher(
+    max_batch_size=settings.keyword_batch_size,
+    max_wait=settings.keyword_batch_wait_ms / 1000,
+    idle_unload=settings.classifier_idle_unload_s,
+)
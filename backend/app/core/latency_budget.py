@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+from typing import Set, Tuple
+
+from app.core.config import settings
+from app.core.engines import degradation_ladder, get_engine, list_engines
+from app.core.summarizer import generate_summary_within_budget, lead_summary, resolve_engine
+from app.core.worker_pool import summarizer_pool, PoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyBudget:
+    """Summarize texts within a latency budget, degrading to cheaper algorithms.
+
+    The summarizer pool picks the best algorithm expected to fit the remaining
+    time (see generate_summary_within_budget), using the throughput estimates
+    of the engines in this process, which learn from the timings the jobs
+    report. The lead sentences are returned without using the pool when no
+    other algorithm is expected to fit, when the pool is full, or when
+    ``max_orphans`` jobs that outlived their budget are still running. Such an
+    orphaned job is left to finish, since it may already be running, and
+    caches its summary for the next identical request.
+    """
+
+    def __init__(self, max_orphans: int = 16):
+        self.max_orphans = max_orphans
+        self._orphans: Set[asyncio.Future] = set()
+
+    @property
+    def orphans(self) -> int:
+        return len(self._orphans)
+
+    async def summarize(self, text: str, n_sents: int, algorithm: str, budget: float) -> Tuple[str, str]:
+        """Summarize within budget seconds, returning the summary and the tier that produced it"""
+        deadline = time.time() + budget
+        ladder = degradation_ladder(resolve_engine(algorithm).name)
+        if all(engine.estimate_seconds(len(text)) > budget for engine in ladder[:-1]):
+            return lead_summary(text, n_sents), "lead"
+        if summarizer_pool.saturated or len(self._orphans) >= self.max_orphans:
+            logger.warning(f"Summarizer is busy, returning the lead sentences ({len(self._orphans)} orphaned jobs)")
+            return lead_summary(text, n_sents), "lead"
+
+        speeds = {engine.name: engine.chars_per_second for engine in list_engines()}
+        job = asyncio.ensure_future(
+            summarizer_pool.run(generate_summary_within_budget, text, n_sents, algorithm, deadline, speeds)
+        )
+        job.add_done_callback(lambda done: self._record(done, len(text)))
+        try:
+            summary, tier, _ = await asyncio.wait_for(asyncio.shield(job), max(deadline - time.time(), 0))
+            return summary, tier
+        except PoolSaturatedError:
+            return lead_summary(text, n_sents), "lead"
+        except asyncio.TimeoutError:
+            logger.warning(f"Latency budget of {budget} s exhausted, returning the lead sentences")
+            self._orphans.add(job)
+            job.add_done_callback(self._orphans.discard)
+            return lead_summary(text, n_sents), "lead"
+
+    def _record(self, job: asyncio.Future, text_length: int) -> None:
+        """Learn the throughput of the engine that ran (also retrieves the job's error, if any)"""
+        if job.cancelled() or job.exception() is not None:
+            return
+        _, tier, seconds = job.result()
+        if seconds is not None:
+            get_engine(tier).record(text_length, seconds)
+
+
+latency_budget = LatencyBudget(max_orphans=settings.text_budget_max_orphans)
@@ -0,0 +1,24 @@
+from sumy.summarizers.lsa import LsaSummarizer
+
+from app.core.scoring import lsa_scores
+
+
+class SparseLsaSummarizer(LsaSummarizer):
+    """sumy's LSA summarizer on a sparse term matrix with a truncated randomized SVD.
+
+    Sentences, words, stemming and stop words are handled as by LsaSummarizer
+    and calls return the same tuple of best sentences in document order, but
+    only the top ``max(MIN_DIMENSIONS, sentences_count)`` singular vectors are
+    computed instead of a full dense SVD.
+    """
+
+    def __call__(self, document, sentences_count):
+        sentences = document.sentences
+        sentence_terms = [
+            [self.stem_word(word) for word in sentence.words if self.normalize_word(word) not in self._stop_words]
+            for sentence in sentences
+        ]
+        if not any(sentence_terms):
+            return ()
+        ranks = iter(lsa_scores(sentence_terms, k=max(self.MIN_DIMENSIONS, sentences_count)))
+        return self._get_best_sentences(sentences, sentences_count, lambda s: next(ranks))
@@ -0,0 +1,38 @@
+import os
+import resource
+import sys
+from typing import Dict
+
+SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+}
+
+
+def process_memory() -> Dict[str, int]:
+    """Memory usage of the current process in bytes.
+
+    On Linux ``pss`` (proportional set size) splits shared pages between the
+    processes mapping them and ``uss`` counts the private pages only, so summing
+    them over the workers shows how much copy-on-write sharing saves.
+    Elsewhere only the peak ``rss`` is available.
+    """
+    usage: Dict[str, int] = {"pid": os.getpid()}
+    try:
+        with open(SMAPS_ROLLUP) as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in SMAPS_FIELDS:
+                    usage[SMAPS_FIELDS[name]] = int(value.split()[0]) * 1024
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        usage["rss"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+        return usage
+    usage["uss"] = usage.get("private_clean", 0) + usage.get("private_dirty", 0)
+    return usage
@@ -0,0 +1,185 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import LinearOperator
+
+SCORING_METHODS = ("frequency", "tfidf", "textrank")
+
+
+def build_sentence_term_matrix(sentence_terms: List[List[str]]) -> Tuple[csr_matrix, Dict[str, int]]:
+    """Build a sparse sentence x term count matrix and its vocabulary"""
+    vocabulary: Dict[str, int] = {}
+    indptr, indices = [0], []
+    for terms in sentence_terms:
+        for term in terms:
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    matrix = csr_matrix((data, indices, indptr), shape=(len(sentence_terms), len(vocabulary)))
+    matrix.sum_duplicates()
+    return matrix, vocabulary
+
+
+def term_vector(vocabulary: Dict[str, int], weights: Dict[str, float]) -> np.ndarray:
+    """Map per-term weights onto the matrix columns (terms without a weight get 0)"""
+    vector = np.zeros(len(vocabulary), dtype=np.float64)
+    for term, weight in weights.items():
+        column = vocabulary.get(term)
+        if column is not None:
+            vector[column] = weight
+    return vector
+
+
+def idf_vector(matrix: csr_matrix) -> np.ndarray:
+    """Smoothed inverse document frequency of each term, sentences being the documents"""
+    n_sents = matrix.shape[0]
+    document_freq = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    return np.log((1 + n_sents) / (1 + document_freq)) + 1
+
+
+def word_counts(significant_words: Union[Mapping[str, int], Iterable[str]]) -> Mapping[str, int]:
+    """Counts of the significant words, given as counts already or as one entry per occurrence"""
+    return significant_words if isinstance(significant_words, Mapping) else Counter(significant_words)
+
+
+def frequency_scores(matrix: csr_matrix, vocabulary: Dict[str, int],
+                     significant_words: Optional[Union[Mapping[str, int], Iterable[str]]] = None) -> np.ndarray:
+    """Sum, for each sentence, the max-normalized frequency of its terms.
+
+    Frequencies are counted over ``significant_words`` (word counts, or words
+    with repetitions) when given, terms not in it weighing 0, otherwise over
+    all the terms of the matrix.
+    """
+    if significant_words is not None:
+        weights = term_vector(vocabulary, word_counts(significant_words))
+    else:
+        weights = np.asarray(matrix.sum(axis=0)).ravel()
+    if weights.size and weights.max() > 0:
+        weights = weights / weights.max()
+    return matrix @ weights
+
+
+def tfidf_scores(matrix: csr_matrix, vocabulary: Dict[str, int],
+                 significant_words: Optional[Union[Mapping[str, int], Iterable[str]]] = None) -> np.ndarray:
+    """Sum the TF-IDF weights of each sentence's terms (only significant ones when given)"""
+    weights = idf_vector(matrix)
+    if significant_words is not None:
+        weights = weights * (term_vector(vocabulary, dict.fromkeys(significant_words, 1.0)) > 0)
+    return matrix @ weights
+
+
+def textrank_scores(matrix: csr_matrix, damping: float = 0.85, max_iter: int = 100,
+                    tol: float = 1e-6) -> np.ndarray:
+    """PageRank over the cosine similarity graph of the TF-IDF sentence vectors"""
+    n_sents = matrix.shape[0]
+    if n_sents == 0:
+        return np.zeros(0)
+    tfidf = csr_matrix(matrix.multiply(idf_vector(matrix)))
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    tfidf = csr_matrix(tfidf.multiply(1 / norms[:, None]))
+
+    similarity = (tfidf @ tfidf.T).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    out_weight[dangling] = 1
+    transition = csr_matrix(similarity.multiply(1 / out_weight[:, None])).T.tocsr()
+
+    ranks = np.full(n_sents, 1 / n_sents)
+    for _ in range(max_iter):
+        # Sentences without similar sentences spread their rank evenly
+        dangling_rank = ranks[dangling].sum() / n_sents
+        new_ranks = (1 - damping) / n_sents + damping * (transition @ ranks + dangling_rank)
+        if np.abs(new_ranks - ranks).sum() < tol:
+            return new_ranks
+        ranks = new_ranks
+    return ranks
+
+
+def score_sentences(sentence_terms: List[List[str]], method: str = "frequency",
+                    significant_words: Optional[Union[Mapping[str, int], Iterable[str]]] = None) -> np.ndarray:
+    """Score every sentence, given the terms it contains, with the requested method"""
+    if method not in SCORING_METHODS:
+        raise ValueError(f"Unknown scoring method {method}, expected one of {SCORING_METHODS}")
+    matrix, vocabulary = build_sentence_term_matrix(sentence_terms)
+    if method == "frequency":
+        return frequency_scores(matrix, vocabulary, significant_words)
+    if method == "tfidf":
+        return tfidf_scores(matrix, vocabulary, significant_words)
+    return textrank_scores(matrix)
+
+
+def randomized_svd(matrix, k: int, n_oversamples: int = 10, n_iter: int = 4,
+                   seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top k singular triplets (u, s, vt) of a matrix or LinearOperator (Halko et al.).
+
+    Only products with the matrix and its transpose are needed, so the cost is
+    linear in its non-zeros for a fixed k instead of cubic in its dimensions.
+    """
+    n_rows, n_cols = matrix.shape
+    k = min(k, n_rows, n_cols)
+    n_samples = min(k + n_oversamples, n_rows, n_cols)
+    rng = np.random.default_rng(seed)
+    basis, _ = np.linalg.qr(matrix @ rng.standard_normal((n_cols, n_samples)))
+    for _ in range(n_iter):
+        # Power iterations sharpen the spectrum, re-orthonormalized for stability
+        basis, _ = np.linalg.qr(matrix.T @ basis)
+        basis, _ = np.linalg.qr(matrix @ basis)
+    u, s, vt = np.linalg.svd(np.asarray(matrix.T @ basis).T, full_matrices=False)
+    return (basis @ u)[:, :k], s[:k], vt[:k]
+
+
+def lsa_scores(sentence_terms: List[List[str]], k: int = 3, smooth: float = 0.4) -> np.ndarray:
+    """LSA rank of each sentence: length of its vector in the top k latent topics.
+
+    Cells hold smoothed max-normalized term frequencies (``smooth + (1 - smooth) * tf``
+    for every cell of a non-empty sentence, as sumy's LsaSummarizer does). That
+    matrix is dense, so it is applied as its sparse tf part plus a rank-one
+    part and decomposed with a truncated randomized SVD.
+    """
+    counts, _ = build_sentence_term_matrix(sentence_terms)
+    n_sents, n_terms = counts.shape
+    if n_sents == 0 or n_terms == 0:
+        return np.zeros(n_sents)
+    max_counts = counts.max(axis=1).toarray().ravel()
+    offsets = np.where(max_counts > 0, smooth, 0.0)
+    max_counts[max_counts == 0] = 1
+    tf = csr_matrix(counts.multiply((1 - smooth) / max_counts[:, None]))
+
+    def matmat(x):
+        x = x.reshape(n_terms, -1)
+        return tf @ x + np.outer(offsets, x.sum(axis=0))
+
+    def rmatmat(y):
+        y = y.reshape(n_sents, -1)
+        return tf.T @ y + np.outer(np.ones(n_terms), offsets @ y)
+
+    weights = LinearOperator(
+        (n_sents, n_terms), dtype=np.float64,
+        matvec=lambda x: matmat(x).ravel(), rmatvec=lambda y: rmatmat(y).ravel(),
+        matmat=matmat, rmatmat=rmatmat
+    )
+    u, s, _ = randomized_svd(weights, k)
+    return np.sqrt((u ** 2) @ (s ** 2))
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k best scores in document order.
+
+    Uses a linear-time partition instead of a full sort. Ties are broken in
+    favour of earlier sentences, like a stable descending sort would.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = scores.size
+    if k >= n:
+        return np.arange(n)
+    if k <= 0:
+        return np.arange(0)
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - above.size]
+    return np.sort(np.concatenate([above, ties]))
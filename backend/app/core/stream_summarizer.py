@@ -0,0 +1,90 @@
+import heapq
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# End of a sentence: terminal punctuation, optional closing quotes or brackets, then whitespace
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s')
+MIN_SENTENCE_LENGTH = 10
+
+
+def split_complete_text(buffer: str) -> Tuple[str, str]:
+    """Split a text buffer into its complete sentences and the unfinished tail.
+
+    Text without any sentence end is cut at its last whitespace instead, so a
+    runaway "sentence" cannot grow the buffer without bound.
+    """
+    end = None
+    for end in SENTENCE_END.finditer(buffer):
+        pass
+    cut = end.end() if end is not None else buffer.rfind(" ") + 1
+    if cut <= 0:
+        cut = len(buffer)
+    return buffer[:cut], buffer[cut:]
+
+
+class StreamingSummarizer:
+    """Frequency-based extractive summary of a text fed block by block.
+
+    Keeps the running frequencies of the significant words and a bounded heap
+    of the ``max_candidates`` best sentences seen so far, so memory depends on
+    the vocabulary and ``max_candidates``, not on the length of the text.
+    Sentence scores move as the frequencies do: the candidates are rescored
+    every ``max_candidates`` sentences and once more before the final pick.
+    """
+
+    def __init__(self, n_sents: int = 5, max_candidates: int = 256):
+        self.n_sents = n_sents
+        self.max_candidates = max(max_candidates, n_sents)
+        self.frequencies: Counter = Counter()
+        self.n_sentences = 0
+        self._max_frequency = 0
+        self._candidates: List[Tuple[float, int, str, List[str]]] = []
+        self._candidate_texts = set()
+        self._next_rescore = self.max_candidates
+
+    def add(self, sentences: List[Tuple[str, List[str]]], significant_words: Dict[str, int]) -> None:
+        """Add the (sentence, terms) pairs and significant word counts of the next block"""
+        self.frequencies.update(significant_words)
+        if significant_words:
+            self._max_frequency = max(self._max_frequency, *(self.frequencies[w] for w in significant_words))
+        for sentence, terms in sentences:
+            position = self.n_sentences
+            self.n_sentences += 1
+            if len(sentence) <= MIN_SENTENCE_LENGTH or sentence in self._candidate_texts:
+                continue
+            candidate = (self._score(terms), position, sentence, terms)
+            if len(self._candidates) < self.max_candidates:
+                heapq.heappush(self._candidates, candidate)
+            elif candidate[0] > self._candidates[0][0]:
+                self._candidate_texts.discard(heapq.heapreplace(self._candidates, candidate)[2])
+            else:
+                continue
+            self._candidate_texts.add(sentence)
+        if self.n_sentences >= self._next_rescore:
+            self._rescore()
+            self._next_rescore = self.n_sentences + self.max_candidates
+
+    def candidates(self, k: int) -> List[Tuple[str, List[str]]]:
+        """The top k (sentence, terms) candidates under the current frequencies, in text order"""
+        from app.core.scoring import build_sentence_term_matrix, term_vector, top_k_indices
+        candidates = sorted(self._candidates, key=lambda candidate: candidate[1])
+        if len(candidates) > k:
+            matrix, vocabulary = build_sentence_term_matrix([candidate[3] for candidate in candidates])
+            weights = term_vector(vocabulary, {term: self.frequencies[term] for term in vocabulary})
+            candidates = [candidates[i] for i in top_k_indices(matrix @ weights, k)]
+        return [(sentence, terms) for _, _, sentence, terms in candidates]
+
+    def summary(self) -> str:
+        """The top n_sents candidates under the final frequencies, in text order"""
+        return ' '.join(sentence for sentence, _ in self.candidates(self.n_sents))
+
+    def _score(self, terms: List[str]) -> float:
+        if not self._max_frequency:
+            return 0.0
+        return sum(self.frequencies.get(term, 0) for term in terms) / self._max_frequency
+
+    def _rescore(self) -> None:
+        self._candidates = [(self._score(terms), position, sentence, terms)
+                            for _, position, sentence, terms in self._candidates]
+        heapq.heapify(self._candidates)
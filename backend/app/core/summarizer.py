@@ -1,42 +1,25 @@
+import gc
+import importlib.util
 import sys
 import json
 import time
 import logging
 import re
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from functools import lru_cache
-from collections import Counter, namedtuple
-from operator import attrgetter
-
-# spaCy import with fallback
-try:
-    import spacy
-    from spacy.lang.en.stop_words import STOP_WORDS
-    SPACY_AVAILABLE = True
-    print("spaCy loaded successfully")
-except Exception as e:
-    print(f"spaCy not available: {e}")
-    SPACY_AVAILABLE = False
-    STOP_WORDS = set()
-
+from collections import Counter
 from string import punctuation
-import nltk
-from newspaper import Article
-from transformers import pipeline, AutoTokenizer
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer as Summarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
 
 from app.core.config import settings
+from app.core.summary_cache import summary_cache, make_cache_key
+from app.core.engines import (
+    SummarizerEngine, register_engine, get_engine, degradation_ladder, load_engine_modules,
+    COST_LOW, COST_MEDIUM, COST_HIGH
+)
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+if TYPE_CHECKING:
+    from newspaper import Article
+    from transformers import AutoTokenizer
 
 # Setup logging
 logging.basicConfig(stream=sys.stdout, format='%(asctime)-15s %(message)s',
@@ -52,57 +35,168 @@ CANDIDATE_LABELS = [
     'politics', 'economy', 'society'
 ]
 KEYWORD_TH = 0.55
+CLASSIFIER_MODEL = "facebook/bart-large-mnli"
+NLTK_DATA = {'punkt': 'tokenizers/punkt', 'stopwords': 'corpora/stopwords'}
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
 
-# Initialize summarizer components
-stemmer = Stemmer(LANGUAGE)
-summarizer = Summarizer(stemmer)
-summarizer.stop_words = get_stop_words(LANGUAGE)
+# The heavy NLP components (spaCy, sumy, transformers, NLTK data) are loaded
+# on first use or by warm_up(), so importing this module stays cheap
+NOT_LOADED = object()
+nlp = NOT_LOADED
 
-# Load spacy model
-nlp = None
-if SPACY_AVAILABLE:
-    try:
-        nlp = spacy.load("en_core_web_sm")
-        logger.info("spaCy model 'en_core_web_sm' loaded successfully")
-    except OSError:
-        logger.warning("Spacy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
+
+def get_nlp():
+    """Return the spaCy pipeline, loading it on first use (None if spaCy or its model is missing)"""
+    global nlp
+    if nlp is NOT_LOADED:
         nlp = None
-else:
-    logger.info("spaCy not available, using fallback methods")
+        try:
+            import spacy
+            nlp = spacy.load("en_core_web_sm")
+            logger.info("spaCy model 'en_core_web_sm' loaded successfully")
+        except OSError:
+            logger.warning("Spacy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
+        except Exception as e:
+            logger.info(f"spaCy not available, using fallback methods: {e}")
+    return nlp
+
+
+def nlp_available() -> bool:
+    """Whether get_nlp() gives a spaCy pipeline, without loading the model if it is not loaded yet"""
+    if nlp is not NOT_LOADED:
+        return nlp is not None
+    return importlib.util.find_spec("spacy") is not None and importlib.util.find_spec("en_core_web_sm") is not None
+
 
-SentenceInfo = namedtuple("SentenceInfo", ("sentence", "order", "rates",))
+@lru_cache
+def ensure_nltk_data() -> None:
+    """Download the NLTK data used by the fallback methods if it is not installed yet"""
+    import nltk
+    for package, path in NLTK_DATA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            try:
+                nltk.download(package, quiet=True)
+            except Exception as e:
+                logger.warning(f"Could not download NLTK data {package}: {e}")
+
+
+@lru_cache
+def load_lsa_summarizer():
+    """Build the sparse LSA summarizer once per process"""
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.utils import get_stop_words
+    from app.core.lsa import SparseLsaSummarizer
+    summarizer = SparseLsaSummarizer(Stemmer(LANGUAGE))
+    summarizer.stop_words = get_stop_words(LANGUAGE)
+    return summarizer
+
+
+def pipeline(*args, **kwargs):
+    """Build a transformers pipeline, importing transformers (and torch) on first use"""
+    from transformers import pipeline as transformers_pipeline
+    return transformers_pipeline(*args, **kwargs)
+
+
+def warm_up(classifier: bool = False) -> None:
+    """Load the summarization models now instead of on the first request"""
+    start = time.time()
+    ensure_nltk_data()
+    get_nlp()
+    load_lsa_summarizer()
+    if classifier:
+        load_classifier()
+    logger.info(f"Summarizer models warmed up in {time.time() - start} s")
 
 
 @lru_cache
 def load_tokenizer(tokenizer_model: str = 'facebook/bart-large-mnli'):
+    from transformers import AutoTokenizer
     return AutoTokenizer.from_pretrained(tokenizer_model)
 
 
-def download_text(url: str) -> Article:
-    """Download and parse article from URL"""
+@lru_cache
+def load_classifier(classifier_model: str = CLASSIFIER_MODEL):
+    """Load the zero-shot classification pipeline once per process and warm it up"""
+    start = time.time()
+    classifier = pipeline("zero-shot-classification", model=classifier_model)
+    classifier("warm up", CANDIDATE_LABELS[:1])
+    logger.info(f"Zero-shot classifier '{classifier_model}' loaded in {time.time() - start} s")
+    return classifier
+
+
+@lru_cache
+def load_summarization_pipeline(summarization_model: str):
+    """Load the seq2seq summarization pipeline used by the abstractive mode once per process"""
+    if settings.abstractive_threads:
+        import torch
+        torch.set_num_threads(settings.abstractive_threads)
+    return pipeline("summarization", model=summarization_model)
+
+
+def unload_models() -> None:
+    """Drop the cached transformers models to release their memory"""
+    load_classifier.cache_clear()
+    load_summarization_pipeline.cache_clear()
+    load_tokenizer.cache_clear()
+    gc.collect()
+    logger.info("Cached transformers models unloaded")
+
+
+def unload_classifier() -> None:
+    """Drop the cached zero-shot classifier to release its memory"""
+    load_classifier.cache_clear()
+    gc.collect()
+    logger.info("Zero-shot classifier unloaded")
+
+
+def preload_models(classifier: bool = False) -> None:
+    """Load the models in a pre-fork master and freeze them for copy-on-write sharing.
+
+    ``gc.freeze()`` moves every live object to the permanent generation, so the
+    collector in the forked workers never touches (and copies) their pages.
+    """
+    warm_up(classifier=classifier)
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Models preloaded, {gc.get_freeze_count()} objects frozen")
+
+
+def download_text(url: str, html: Optional[str] = None) -> "Article":
+    """Download and parse article from URL, or parse its already fetched HTML"""
+    from newspaper import Article
     article = Article(url)
-    article.download()
+    if html is None:
+        article.download()
+    else:
+        article.download(input_html=html)
     article.parse()
     return article
 
 
+def get_significant_words_from_doc(doc) -> List[str]:
+    """Get a list of important lemmas from an already parsed spaCy Doc"""
+    return [token.lemma_.lower() for token in doc
+            if (not token.is_stop and
+                not token.is_punct and
+                not token.is_space and
+                len(token.text) > 2 and
+                token.pos_ in ['NOUN', 'VERB', 'ADJ', 'ADV'])]
+
+
 def get_significant_words_list(text: str) -> List[str]:
     """Get a list of important words excluding stop words and punctuation"""
     words = []
+    nlp = get_nlp()
     
     if nlp is not None:
         # Use spaCy for better word extraction
-        doc = nlp(text)
-        for token in doc:
-            if (not token.is_stop and 
-                not token.is_punct and 
-                not token.is_space and 
-                len(token.text) > 2 and
-                token.pos_ in ['NOUN', 'VERB', 'ADJ', 'ADV']):
-                words.append(token.lemma_.lower())
+        words = get_significant_words_from_doc(nlp(text))
     else:
         # Fallback to NLTK and basic processing
         try:
+            ensure_nltk_data()
             from nltk.corpus import stopwords
             from nltk.tokenize import word_tokenize
             stop_words = set(stopwords.words('english'))
@@ -119,54 +213,66 @@ def get_significant_words_list(text: str) -> List[str]:
     return words
 
 
-def get_frequency_words(words: List[str]) -> Counter:
-    """Get a counter with the frequency of each word normalized to one"""
-    freq_word = Counter(words)
-    if not freq_word:
-        return freq_word
-    max_freq = freq_word.most_common(1)[0][1]
-    for word in freq_word.keys():
-        freq_word[word] = (freq_word[word] / max_freq)
-    return freq_word
+def resolve_engine(name: str) -> SummarizerEngine:
+    """The engine running for an algorithm: "auto" is spaCy with the configured scoring method, or LSA"""
+    if name == "auto":
+        name = settings.scoring_method if nlp_available() else "lsa"
+    return get_engine(name)
 
 
-def get_sent_strength(sentences: List[str], freq_word: Counter) -> Dict:
-    """Get sentence importance scores based on word frequencies"""
-    sent_strength = {}
-    
-    for sent in sentences:
-        if nlp is not None:
-            # Use spaCy for better sentence processing
-            doc = nlp(sent)
-            words = [token.lemma_.lower() for token in doc 
-                    if not token.is_stop and not token.is_punct and not token.is_space]
-        else:
-            # Fallback to simple word extraction
-            words = re.findall(r'\b[a-zA-Z]+\b', sent.lower())
-        
-        score = 0
-        for word in words:
-            if word in freq_word:
-                score += freq_word[word]
-        sent_strength[sent] = score
-    
-    return sent_strength
+def engine_algorithm_id(engine: SummarizerEngine) -> str:
+    """Identifier of the variant of an engine running in this process, used in summary cache keys"""
+    from app.core.scoring import SCORING_METHODS
+    if engine.name in SCORING_METHODS:
+        return f"spacy:{engine.name}" if get_nlp() is not None else f"regex:{engine.name}"
+    if engine.name == "lsa":
+        return "lsa:randomized"
+    if engine.name == "abstractive":
+        return f"abstractive:{settings.abstractive_model}"
+    return engine.name
 
 
-def get_extractive_summary(sent_strength: Dict, n_sents: int = 5):
-    """Extract top sentences based on importance scores"""
-    infos = (SentenceInfo(s, o, sent_strength.get(s)) 
-        for o, s in enumerate(sent_strength.keys()))
+def get_pipeline_algorithm() -> str:
+    """Name of the algorithm used by extractive_summary_pipeline"""
+    return engine_algorithm_id(resolve_engine("auto"))
 
-    infos = sorted(infos, key=attrgetter("rates"), reverse=True)[:n_sents]
-    infos = sorted(infos, key=attrgetter("order"))
-    logger.info(f"Extracted {len(infos)} sentences ...")
-    return tuple(i.sentence for i in infos)
+
+def summary_cache_key(text: str, n_sents: int, engine: SummarizerEngine) -> str:
+    return make_cache_key(text, n_sents, engine_algorithm_id(engine))
+
+
+def cached_summary_pipeline(text: str, n_sents: int = 5, abstractive: bool = False,
+                            algorithm: str = "auto") -> Tuple[str, str]:
+    """Run the requested summarizer engine, reusing cached summaries of identical content.
+
+    An engine that fails hands over to its fallback engine. Summaries are
+    cached under the engine that produced them, so a fallback summary is
+    never served later as the output of the requested algorithm. Returns the
+    summary and the name of that engine (its tier).
+    """
+    engine = resolve_engine("abstractive" if abstractive else algorithm)
+    while True:
+        key = summary_cache_key(text, n_sents, engine)
+        summary = summary_cache.get(key)
+        if summary is not None:
+            logger.info("Summary cache hit")
+            return summary, engine.name
+        try:
+            summary = engine.summarize(text, n_sents)
+        except Exception as e:
+            if engine.fallback is None:
+                raise
+            logger.error(f"Error in {engine.name} summarization, falling back to {engine.fallback}: {e}")
+            engine = resolve_engine(engine.fallback)
+            continue
+        if summary:
+            summary_cache.set(key, summary)
+        return summary, engine.name
 
 
 def extractive_summary_pipeline(text: str, n_sents: int = 5) -> str:
     """Generate extractive summary using the best available method"""
-    if nlp is not None:
+    if get_nlp() is not None:
         # Use spaCy-based extractive summarization
         return extractive_summary_spacy(text, n_sents)
     else:
@@ -175,53 +281,125 @@ def extractive_summary_pipeline(text: str, n_sents: int = 5) -> str:
 
 
 def extractive_summary_spacy(text: str, n_sents: int = 5) -> str:
-    """Generate extractive summary using spaCy-based approach"""
-    try:
-        # Split text into sentences using spaCy
+    """Generate extractive summary using spaCy-based approach.
+
+    The document goes through the spaCy pipeline once: lemma frequencies and
+    sentence scores are both computed from the tokens of the same Doc, and all
+    sentences are scored at once by the vectorized scoring engine.
+    """
+    return summarize_doc(get_nlp()(text), n_sents)
+
+
+def summarize_doc(doc, n_sents: int = 5, method: Optional[str] = None) -> str:
+    """Select the top sentences of an already parsed spaCy Doc"""
+    from app.core.scoring import score_sentences, top_k_indices
+    # Split text into sentences using spaCy
+    sents = [sent for sent in doc.sents if len(sent.text.strip()) > 10]
+    
+    if len(sents) <= n_sents:
+        return ' '.join(sent.text.strip() for sent in sents)
+    
+    # Get the terms of each distinct sentence
+    sentence_terms = {}
+    for sent in sents:
+        sentence = sent.text.strip()
+        if sentence not in sentence_terms:
+            sentence_terms[sentence] = [token.lemma_.lower() for token in sent
+                                        if not token.is_stop and not token.is_punct and not token.is_space]
+    sentences = list(sentence_terms)
+    
+    # Score all sentences against the significant words of the document
+    scores = score_sentences(list(sentence_terms.values()), method=method or settings.scoring_method,
+                             significant_words=get_significant_words_from_doc(doc))
+    
+    # Extract top sentences
+    indices = top_k_indices(scores, n_sents)
+    logger.info(f"Extracted {len(indices)} sentences ...")
+    
+    return ' '.join(sentences[i] for i in indices)
+
+
+def scored_summary(text: str, n_sents: int = 5, method: str = "frequency") -> str:
+    """Extractive summary scored with one of the scoring methods, with or without spaCy"""
+    nlp = get_nlp()
+    if nlp is not None:
+        return summarize_doc(nlp(text), n_sents, method=method)
+    sentences, significant_words = get_sentence_terms(text)
+    return ' '.join(sentence for sentence, _ in select_sentences(sentences, significant_words, n_sents, method))
+
+
+def select_sentences(sentences: List[Tuple[str, List[str]]], significant_words: Dict[str, int], k: int,
+                     method: str = "frequency") -> List[Tuple[str, List[str]]]:
+    """Top k distinct (sentence, terms) pairs, in text order, scored against the significant word counts"""
+    from app.core.scoring import score_sentences, top_k_indices
+    sentence_terms = {}
+    for sentence, terms in sentences:
+        if len(sentence) > 10:
+            sentence_terms.setdefault(sentence, terms)
+    candidates = list(sentence_terms.items())
+    if len(candidates) <= k:
+        return candidates
+    scores = score_sentences(list(sentence_terms.values()), method=method,
+                             significant_words=significant_words)
+    return [candidates[i] for i in top_k_indices(scores, k)]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences at terminal punctuation, for when spaCy is not available"""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def get_sentence_terms(text: str) -> Tuple[List[Tuple[str, List[str]]], Dict[str, int]]:
+    """Split a block of text into (sentence, terms) pairs and count its significant words.
+
+    The terms and significant words are the ones summarize_doc scores with, so
+    blocks of a long text can be processed one at a time (see stream_summarizer).
+    """
+    nlp = get_nlp()
+    if nlp is not None:
         doc = nlp(text)
-        sentences = [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 10]
-        
-        if len(sentences) <= n_sents:
-            return ' '.join(sentences)
-        
-        # Get significant words
-        words = get_significant_words_list(text)
-        
-        # Get word frequencies
-        freq_word = get_frequency_words(words)
-        
-        # Calculate sentence strengths
-        sent_strength = get_sent_strength(sentences, freq_word)
-        
-        # Extract top sentences
-        summary_sentences = get_extractive_summary(sent_strength, n_sents)
-        
-        return ' '.join(summary_sentences)
-        
-    except Exception as e:
-        logger.error(f"Error in spaCy summarization: {e}")
-        # Fallback to LSA
-        return extractive_summary_lsa(text, n_sents)
+        sentences = [
+            (sent.text.strip(), [token.lemma_.lower() for token in sent
+                                 if not token.is_stop and not token.is_punct and not token.is_space])
+            for sent in doc.sents
+        ]
+        significant_words = get_significant_words_from_doc(doc)
+    else:
+        sentences = [
+            (sentence, re.findall(r'\b[a-zA-Z]+\b', sentence.lower()))
+            for sentence in split_sentences(text)
+        ]
+        significant_words = get_significant_words_list(text)
+    return [(sentence, terms) for sentence, terms in sentences if sentence], dict(Counter(significant_words))
 
 
-def extractive_summary_lsa(text: str, n_sents: int = 5) -> str:
-    """Generate extractive summary using LSA algorithm"""
-    try:
-        parser = PlaintextParser.from_string(text, Tokenizer(LANGUAGE))
-        extractive_summary = ' '.join([sentence._text for sentence in summarizer(parser.document, n_sents)])
-        return extractive_summary
-    except Exception as e:
-        logger.error(f"Error in LSA summarization: {e}")
-        # Fallback to simple truncation
-        sentences = text.split('.')[:n_sents]
-        return '. '.join(sentences) + '.'
+def select_section_candidates(section: str, k: int, method: str = "frequency"
+                              ) -> Tuple[List[Tuple[str, List[str]]], Dict[str, int]]:
+    """Best k (sentence, terms) pairs of a section under its own word counts, and its significant word counts"""
+    sentences, significant_words = get_sentence_terms(section)
+    return select_sentences(sentences, significant_words, k, method), significant_words
 
 
-def get_nest_sentences(document: str, tokenizer: AutoTokenizer, token_max_length: int = 1024) -> List[str]:
-    """Split document into chunks with maximum token length"""
-    chunks = []
-    current_chunk = ""
-    
+def extractive_summary_lsa(text: str, n_sents: int = 5) -> str:
+    """Generate extractive summary using LSA algorithm"""
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+    ensure_nltk_data()
+    parser = PlaintextParser.from_string(text, Tokenizer(LANGUAGE))
+    summarizer = load_lsa_summarizer()
+    return ' '.join([sentence._text for sentence in summarizer(parser.document, n_sents)])
+
+
+def get_nest_sentences(document: str, tokenizer: "AutoTokenizer", token_max_length: int = 1024,
+                       overlap_tokens: int = 0) -> List[str]:
+    """Split document into chunks with maximum token length.
+
+    Every sentence is tokenized once, in a single batched call, and chunks are
+    built from the running token counts, so chunking is linear in the document
+    length. With ``overlap_tokens`` > 0 each chunk starts with the trailing
+    sentences of the previous one, up to that many tokens.
+    """
+    nlp = get_nlp()
     if nlp is not None:
         # Use spaCy for better sentence splitting
         doc = nlp(document)
@@ -230,54 +408,164 @@ def get_nest_sentences(document: str, tokenizer: AutoTokenizer, token_max_length
         # Fallback to simple sentence splitting
         sentences = [s.strip() for s in document.split('.') if s.strip()]
     
-    for sentence in sentences:
-        if not sentence:
-            continue
-        test_chunk = current_chunk + " " + sentence if current_chunk else sentence
-        tokens = tokenizer(test_chunk, truncation=False, padding=False)['input_ids']
-        
-        if len(tokens) <= token_max_length:
-            current_chunk = test_chunk
-        else:
-            if current_chunk:
-                chunks.append(current_chunk)
-            current_chunk = sentence
+    if not sentences:
+        return []
     
-    if current_chunk:
-        chunks.append(current_chunk)
+    encoded = tokenizer(sentences, add_special_tokens=False, truncation=False, padding=False)
+    counts = [len(ids) for ids in encoded['input_ids']]
+    budget = token_max_length - tokenizer.num_special_tokens_to_add()
+    
+    chunks = []
+    current, current_tokens = [], 0
+    for i, n_tokens in enumerate(counts):
+        if current and current_tokens + n_tokens > budget:
+            chunks.append(current)
+            # Carry the trailing sentences of the closed chunk over as overlap
+            carried, carried_tokens = [], 0
+            for j in reversed(current):
+                if carried_tokens + counts[j] > overlap_tokens:
+                    break
+                carried.append(j)
+                carried_tokens += counts[j]
+            current, current_tokens = carried[::-1], carried_tokens
+            if current_tokens + n_tokens > budget:
+                current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += n_tokens
+    
+    if current:
+        chunks.append(current)
     
     logger.info(f'Returning {len(chunks)} number of chunk strings')
-    return chunks
-
-
-def generate_summary_from_text(text: str) -> str:
-    """Generate summary from plain text"""
+    return [' '.join(sentences[i] for i in chunk) for chunk in chunks]
+
+
+def abstractive_summary_pipeline(text: str, n_sents: int = 5) -> str:
+    """Generate abstractive summary with map-reduce over token-bounded chunks.
+
+    The document is split with get_nest_sentences, the chunks are summarized in
+    batches and the concatenated chunk summaries are reduced the same way until
+    they fit in a single chunk.
+    """
+    model = load_summarization_pipeline(settings.abstractive_model)
+    tokenizer = load_tokenizer(settings.abstractive_model)
+    chunks = get_nest_sentences(text, tokenizer, settings.abstractive_chunk_tokens)
+    if not chunks:
+        return ''
+    rounds = 0
+    while True:
+        rounds += 1
+        outputs = model(chunks, max_length=settings.abstractive_summary_tokens,
+                        truncation=True, batch_size=settings.abstractive_batch_size)
+        summary = ' '.join(output['summary_text'].strip() for output in outputs)
+        if len(chunks) == 1:
+            break
+        reduced = get_nest_sentences(summary, tokenizer, settings.abstractive_chunk_tokens)
+        if len(reduced) >= len(chunks):
+            # Chunk summaries don't shrink any more, keep what we have
+            break
+        chunks = reduced
+    logger.info(f"Abstractive summary reduced in {rounds} rounds")
+    return summary
+
+
+def generate_summary_from_text(text: str, n_sents: int = 5, abstractive: bool = False,
+                               algorithm: str = "auto") -> Tuple[str, str]:
+    """Generate summary from plain text, returning it with the tier (engine) that produced it"""
     start = time.time()
     logger.info(f"Generating summary from text of length: {len(text)}")
     
     try:
-        total_summary = extractive_summary_pipeline(text, n_sents=5)
+        total_summary, tier = cached_summary_pipeline(text, n_sents=n_sents, abstractive=abstractive,
+                                                      algorithm=algorithm)
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
         # Fallback to simple truncation
-        if nlp is not None:
-            doc = nlp(text)
-            sentences = [sent.text.strip() for sent in doc.sents][:3]
-        else:
-            sentences = text.split('.')[:3]
-        total_summary = '. '.join(sentences) + '.'
+        total_summary, tier = lead_summary(text, n_sents), "lead"
     
     logger.info(f"*** ELAPSED CREATE SUMMARY FROM TEXT: {time.time() - start} s")
-    return total_summary
+    return total_summary, tier
+
+
+def generate_summary_within_budget(text: str, n_sents: int = 5, algorithm: str = "auto",
+                                   deadline: Optional[float] = None,
+                                   speeds: Optional[Dict[str, float]] = None) -> Tuple[str, str, Optional[float]]:
+    """Summarize with the first engine of the degradation ladder expected to finish before deadline"""
+    speeds = speeds or {}
+    ladder = degradation_ladder(resolve_engine(algorithm).name, speeds)
+    for engine in ladder:
+        key = summary_cache_key(text, n_sents, engine)
+        summary = summary_cache.get(key)
+        if summary is not None:
+            return summary, engine.name, None
+        remaining = float("inf") if deadline is None else deadline - time.time()
+        estimate = len(text) / speeds.get(engine.name, engine.chars_per_second)
+        if engine is not ladder[-1] and estimate > remaining:
+            continue
+        start = time.time()
+        try:
+            summary = engine.summarize(text, n_sents)
+        except Exception as e:
+            logger.error(f"Error in {engine.name} summarization: {e}")
+            continue
+        if summary:
+            summary_cache.set(key, summary)
+        return summary, engine.name, time.time() - start
+    return lead_summary(text, n_sents), "lead", None
+
+
+def lead_summary(text: str, n_sents: int = 5) -> str:
+    """The first n_sents sentences of the text"""
+    return ' '.join(split_sentences(text)[:n_sents])
+
 
+def generate_summaries_from_texts(texts: List[str], n_sents: int = 5, batch_size: Optional[int] = None,
+                                  n_process: Optional[int] = None) -> List[str]:
+    """Generate summaries for many texts, in input order.
 
-def generate_summary_from_url(url: str) -> str:
-    """Generate summary from URL"""
+    Texts missing from the summary cache are streamed through ``nlp.pipe`` so
+    the spaCy pipeline overhead is amortized over batches of ``batch_size``
+    documents, optionally parsed by ``n_process`` processes.
+    """
+    start = time.time()
+    algorithm = get_pipeline_algorithm()
+    keys = [make_cache_key(text, n_sents, algorithm) for text in texts]
+    summaries = [summary_cache.get(key) for key in keys]
+    todo = [i for i, summary in enumerate(summaries) if summary is None]
+    logger.info(f"Generating summaries for {len(texts)} texts, {len(texts) - len(todo)} cached")
+    
+    nlp = get_nlp()
+    if nlp is not None and todo:
+        docs = nlp.pipe((texts[i] for i in todo),
+                        batch_size=batch_size or settings.nlp_batch_size,
+                        n_process=n_process or settings.nlp_n_process)
+        for i, doc in zip(todo, docs):
+            try:
+                summaries[i] = summarize_doc(doc, n_sents)
+            except Exception as e:
+                logger.error(f"Error in spaCy summarization, falling back to lsa: {e}")
+                # Cached as an LSA summary, not under the key of the spaCy pipeline
+                summaries[i] = cached_summary_pipeline(texts[i], n_sents, algorithm="lsa")[0]
+                continue
+            if summaries[i]:
+                summary_cache.set(keys[i], summaries[i])
+    else:
+        for i in todo:
+            summaries[i] = cached_summary_pipeline(texts[i], n_sents)[0]
+    
+    logger.info(f"*** ELAPSED CREATE SUMMARIES FROM {len(texts)} TEXTS: {time.time() - start} s")
+    return summaries
+
+
+def generate_summary_from_url(url: str, html: Optional[str] = None, n_sents: int = 5,
+                              algorithm: str = "auto") -> str:
+    """Generate summary from URL, or from its HTML when it was fetched already"""
     start = time.time()
     try:
-        article = download_text(url)
+        article = download_text(url, html=html)
         logger.info(f'Retrieved url text of length: {len(article.text)}')
-        total_summary = extractive_summary_pipeline(article.text)
+        total_summary, tier = cached_summary_pipeline(article.text, n_sents=n_sents, algorithm=algorithm)
+        logger.info(f"Summarized {url} with {tier}")
         logger.info(f"*** ELAPSED CREATE SUMMARY FROM URL: {time.time() - start} s")
         return total_summary
     except Exception as e:
@@ -285,17 +573,79 @@ def generate_summary_from_url(url: str) -> str:
         raise
 
 
+def get_top_keywords(preds: Dict) -> List[str]:
+    """Keep the top 5 predicted labels with a score greater than KEYWORD_TH"""
+    labels, scores = preds['labels'], preds['scores']
+    logger.info(f'Keywords labels predicted: {labels}')
+    top5 = labels[:5]
+    top = [x for i, x in enumerate(top5) if scores[i] > KEYWORD_TH]
+    logger.info(f'Top keywords with score greater than {KEYWORD_TH}: {top}')
+    return top
+
+
 def generate_keywords(summary: str) -> List[str]:
     """Generate keywords from summary using zero-shot classification"""
     try:
-        classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+        classifier = load_classifier()
         preds = classifier(summary, CANDIDATE_LABELS, multi_label=True)
-        labels, scores = preds['labels'], preds['scores']
-        logger.info(f'Keywords labels predicted: {labels}')
-        top5 = labels[:5]
-        top = [x for i, x in enumerate(top5) if scores[i] > KEYWORD_TH]
-        logger.info(f'Top keywords with score greater than {KEYWORD_TH}: {top}')
-        return top
+        return get_top_keywords(preds)
     except Exception as e:
         logger.error(f"Error generating keywords: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+def generate_keywords_batch(summaries: List[str], batch_size: int = 16) -> List[List[str]]:
+    """Generate keywords for several summaries with batched zero-shot classification.
+
+    The (summary, label) pairs of all summaries are run through the model in
+    padded batches of ``batch_size`` pairs. Results are in input order.
+    """
+    keywords = [[] for _ in summaries]
+    indexes = [i for i, summary in enumerate(summaries) if summary and summary.strip()]
+    if not indexes:
+        return keywords
+    try:
+        start = time.time()
+        classifier = load_classifier()
+        preds = classifier([summaries[i] for i in indexes], CANDIDATE_LABELS,
+                           multi_label=True, batch_size=batch_size)
+        if isinstance(preds, dict):
+            preds = [preds]
+        for i, pred in zip(indexes, preds):
+            keywords[i] = get_top_keywords(pred)
+        logger.info(f"*** ELAPSED KEYWORDS FOR {len(indexes)} SUMMARIES: {time.time() - start} s")
+    except Exception as e:
+        logger.error(f"Error generating keywords batch: {e}")
+    return keywords
+
+
+# The engines look the functions up when called, so they follow patched or reloaded module globals
+register_engine(SummarizerEngine(
+    "auto", lambda text, n_sents: extractive_summary_pipeline(text, n_sents), COST_MEDIUM, "O(n)", 50_000,
+    "spaCy sentence scoring with the configured scoring method, or LSA without spaCy", fallback="lsa"
+))
+register_engine(SummarizerEngine(
+    "frequency", lambda text, n_sents: scored_summary(text, n_sents, method="frequency"), COST_LOW, "O(n)", 60_000,
+    "Sentences ranked by the frequency of their significant words", fallback="lsa"
+))
+register_engine(SummarizerEngine(
+    "tfidf", lambda text, n_sents: scored_summary(text, n_sents, method="tfidf"), COST_LOW, "O(n)", 60_000,
+    "Sentences ranked by the TF-IDF weight of their significant words", fallback="lsa"
+))
+register_engine(SummarizerEngine(
+    "textrank", lambda text, n_sents: scored_summary(text, n_sents, method="textrank"), COST_MEDIUM, "O(n^2)", 30_000,
+    "PageRank over the sentence similarity graph", fallback="lsa"
+))
+register_engine(SummarizerEngine(
+    "lsa", lambda text, n_sents: extractive_summary_lsa(text, n_sents), COST_MEDIUM, "O(n)", 100_000,
+    "Latent semantic analysis with a truncated randomized SVD", fallback="lead"
+))
+register_engine(SummarizerEngine(
+    "abstractive", lambda text, n_sents: abstractive_summary_pipeline(text, n_sents), COST_HIGH, "O(n)", 2_000,
+    "Map-reduce summarization with a transformers sequence-to-sequence model", fallback="auto"
+))
+register_engine(SummarizerEngine(
+    "lead", lambda text, n_sents: lead_summary(text, n_sents), COST_LOW, "O(n)", 5_000_000,
+    "The first sentences of the text, the fallback when nothing else fits the latency budget"
+))
+load_engine_modules()
@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expired / surplus rows are purged from the disk layer every EVICT_EVERY writes
+EVICT_EVERY = 100
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share a key"""
+    return " ".join(text.split())
+
+
+def make_cache_key(text: str, n_sents: int, algorithm: str) -> str:
+    """Hash the normalized text together with the summarization parameters"""
+    digest = hashlib.sha256(f"{algorithm}:{n_sents}:".encode())
+    digest.update(normalize_text(text).encode())
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Two-level summary cache: an in-memory LRU backed by an optional SQLite file.
+
+    Entries older than ``ttl`` seconds are ignored. The memory layer keeps at
+    most ``max_size`` entries; the disk layer is trimmed to ``max_entries``
+    rows, dropping the least recently used first.
+    """
+
+    def __init__(self, max_size: int = 1024, db_path: Optional[str] = None,
+                 ttl: int = 86400, max_entries: int = 100000):
+        self.max_size = max_size
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summary_cache ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_summary_cache_accessed_at ON summary_cache (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                summary, created_at = entry
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    return summary
+                del self._memory[key]
+
+            if self.db_path is None:
+                return None
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT summary, created_at FROM summary_cache WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE summary_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading summary cache: {e}")
+                return None
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def set(self, key: str, summary: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, summary, now)
+            if self.db_path is None:
+                return
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, summary, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, summary, now, now)
+                )
+                self._writes += 1
+                if self._writes % EVICT_EVERY == 0:
+                    self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing summary cache: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self.db_path is not None:
+                conn = self._connect()
+                conn.execute("DELETE FROM summary_cache")
+                conn.commit()
+
+    def _remember(self, key: str, summary: str, created_at: float) -> None:
+        self._memory[key] = (summary, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM summary_cache WHERE created_at <= ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM summary_cache WHERE key IN ("
+            "SELECT key FROM summary_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+summary_cache = SummaryCache(
+    max_size=settings.summary_cache_size,
+    db_path=settings.summary_cache_path,
+    ttl=settings.summary_cache_ttl,
+    max_entries=settings.summary_cache_max_entries,
+)
@@ -0,0 +1,29 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL used to detect duplicates.
+
+    Lowercases the scheme and host, drops default ports and the fragment, and
+    sorts the query parameters. An empty path is the root path "/". Trailing
+    slashes are otherwise kept: "/a" and "/a/" can be different resources.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    """SHA-256 hex digest of the normalized URL"""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the pool already holds the maximum number of pending jobs"""
+
+
+def _init_worker() -> None:
+    """Load the summarization models once in each worker process"""
+    from app.core.summarizer import warm_up
+    warm_up()
+
+
+def _init_classifier_worker() -> None:
+    """Load the zero-shot classifier in the classifier worker, if asked to at start"""
+    if settings.warm_up_classifier:
+        from app.core.summarizer import load_classifier
+        load_classifier()
+
+
+class SummarizerPool:
+    """Run CPU-bound summarization jobs off the event loop.
+
+    Jobs go to a pool of worker processes that run ``initializer`` (loading
+    the models) once at start. With ``max_workers=0`` a pool of
+    ``thread_workers`` threads in the API process is used instead.
+    At most ``max_pending`` jobs can be queued or running; over that limit
+    ``run`` raises ``PoolSaturatedError`` instead of queueing more work.
+    ``warm_up`` jobs are not counted: they are not requests to shed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 64,
+                 initializer: Callable[[], None] = _init_worker, thread_workers: Optional[int] = None,
+                 name: str = "Summarizer"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.initializer = initializer
+        self.thread_workers = thread_workers
+        self.name = name
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.ready = False
+        # Why loading the models failed after every warm-up attempt
+        self.warm_up_error: Optional[str] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def saturated(self) -> bool:
+        return self._pending >= self.max_pending
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.max_workers == 0:
+            self._executor = ThreadPoolExecutor(max_workers=self.thread_workers,
+                                                thread_name_prefix=self.name.lower())
+            logger.info(f"{self.name} pool started in thread mode")
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+            logger.info(f"{self.name} pool started with {self._executor._max_workers} worker processes")
+
+    async def warm_up(self, attempts: int = 1, retry_delay: float = 0) -> None:
+        """Load the models in every worker, then mark the pool ready.
+
+        Failed attempts are retried after ``retry_delay`` seconds; once all
+        ``attempts`` failed the error is kept in ``warm_up_error`` and raised.
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                self.start()
+                if self.max_workers == 0:
+                    await self._submit(self.initializer)
+                else:
+                    # One job per worker: busy workers make the pool spawn (and initialize) all of them
+                    await asyncio.gather(*[
+                        self._submit(self.initializer) for _ in range(self._executor._max_workers)
+                    ])
+            except Exception as e:
+                logger.error(f"{self.name} pool warm-up attempt {attempt}/{attempts} failed: {e}")
+                if attempt == attempts:
+                    self.warm_up_error = str(e) or type(e).__name__
+                    raise
+                await asyncio.sleep(retry_delay)
+            else:
+                break
+        self.warm_up_error = None
+        self.ready = True
+        logger.info(f"{self.name} pool is ready")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.ready = False
+            logger.info(f"{self.name} pool shut down")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the pool and wait for the result"""
+        if self.saturated:
+            raise PoolSaturatedError(f"{self.name} pool has {self._pending} pending jobs")
+        self._pending += 1
+        try:
+            return await self._submit(fn, *args, **kwargs)
+        finally:
+            self._pending -= 1
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a job in the pool without counting it against ``max_pending``"""
+        self.start()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed): recreate the pool on next use
+            logger.error(f"{self.name} pool is broken, restarting it")
+            self.shutdown()
+            raise
+
+
+summarizer_pool = SummarizerPool(
+    max_workers=settings.summarizer_workers,
+    max_pending=settings.summarizer_max_pending,
+)
+
+# The zero-shot classifier is large: a single worker (process, or thread in
+# thread mode) holds the only copy instead of one per summarizer worker
+classifier_pool = SummarizerPool(
+    max_workers=0 if settings.summarizer_workers == 0 else 1,
+    max_pending=settings.summarizer_max_pending,
+    initializer=_init_classifier_worker,
+    thread_workers=1,
+    name="Classifier",
+)
@@ -1,49 +1,205 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, update, insert, func, or_, literal_column, text
 from sqlalchemy.orm import selectinload
+from app.core.urls import url_hash
 from app.models.summary import Summary
+from app.models.summary_keyword import SummaryKeyword
+from app.db.fulltext import SQLITE_FTS_TABLE, fts5_query
 from app.schemas.summary_schema import SummaryCreate, SummaryUpdate
 
 
+def normalize_keyword(keyword: str) -> str:
+    return keyword.strip().lower()
+
+
+def split_keywords(summary: Summary) -> List[str]:
+    """Normalized, deduplicated keywords of a summary: its top keyword and the comma-joined others"""
+    keywords = [summary.key_top or ""] + (summary.keywords or "").split(",")
+    return list(dict.fromkeys(k for k in map(normalize_keyword, keywords) if k))
+
+
+def insert_ignoring_duplicates(db: AsyncSession, rows: List[Dict[str, Any]]):
+    """INSERT of summary rows that skips the URLs already stored (ON CONFLICT DO NOTHING)"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(Summary).values(rows).on_conflict_do_nothing(index_elements=["url_hash"])
+
+
 class CRUDSummary:
-    async def create(self, db: AsyncSession, *, obj_in: SummaryCreate) -> Summary:
+    async def _index_keywords(self, db: AsyncSession, summaries: List[Summary], replace: bool = False) -> None:
+        """Write the keyword rows of already flushed summaries, replacing the old ones if asked"""
+        if replace:
+            await db.execute(
+                delete(SummaryKeyword).where(SummaryKeyword.summary_id.in_([s.id for s in summaries]))
+            )
+        rows = [
+            {"summary_id": summary.id, "keyword": keyword}
+            for summary in summaries
+            for keyword in split_keywords(summary)
+        ]
+        if rows:
+            await db.execute(insert(SummaryKeyword), rows)
+
+    async def create(self, db: AsyncSession, *, obj_in: SummaryCreate, commit: bool = True) -> Summary:
         db_obj = Summary(
             url=str(obj_in.url),
+            url_hash=url_hash(str(obj_in.url)),
             summary=obj_in.summary or "",
             key_top=obj_in.key_top or "",
-            keywords=obj_in.keywords or ""
+            keywords=obj_in.keywords or "",
+            algorithm=obj_in.algorithm,
+            n_sents=obj_in.n_sents
         )
         db.add(db_obj)
+        await db.flush()
+        await self._index_keywords(db, [db_obj])
+        if not commit:
+            return db_obj
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def upsert_multi(self, db: AsyncSession, *, objs_in: List[SummaryCreate],
+                           commit: bool = True) -> Tuple[List[Summary], List[Summary]]:
+        """Insert the summaries whose URL is not stored yet and return (all summaries, created ones).
+
+        Relies on the unique url_hash index, so concurrent requests for the same
+        URL end up sharing one row instead of racing to insert duplicates.
+        """
+        rows = {}
+        for obj_in in objs_in:
+            rows.setdefault(url_hash(str(obj_in.url)), {
+                "url": str(obj_in.url),
+                "url_hash": url_hash(str(obj_in.url)),
+                "summary": obj_in.summary or "",
+                "key_top": obj_in.key_top or "",
+                "keywords": obj_in.keywords or "",
+                "algorithm": obj_in.algorithm,
+                "n_sents": obj_in.n_sents
+            })
+        result = await db.execute(insert_ignoring_duplicates(db, list(rows.values())).returning(Summary.id))
+        created_ids = set(result.scalars().all())
+        result = await db.execute(
+            select(Summary).where(Summary.url_hash.in_(rows)).execution_options(populate_existing=True)
+        )
+        by_hash = {summary.url_hash: summary for summary in result.scalars().all()}
+        summaries = [by_hash[key] for key in rows]
+        created = [summary for summary in summaries if summary.id in created_ids]
+        await self._index_keywords(db, created)
+        if commit:
+            await db.commit()
+        return summaries, created
+
+    async def get_or_create(self, db: AsyncSession, *, obj_in: SummaryCreate,
+                            commit: bool = True) -> Tuple[Summary, bool]:
+        """Return the summary of the URL, inserting it if missing, and whether it was created"""
+        summaries, created = await self.upsert_multi(db, objs_in=[obj_in], commit=commit)
+        return summaries[0], bool(created)
+
     async def get(self, db: AsyncSession, id: int) -> Optional[Summary]:
         result = await db.execute(select(Summary).where(Summary.id == id))
         return result.scalar_one_or_none()
 
-    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[Summary]:
-        result = await db.execute(select(Summary).offset(skip).limit(limit))
-        return result.scalars().all()
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, cursor: Optional[int] = None, limit: int = 100,
+                        fields: Optional[List[str]] = None, newest_first: bool = False) -> List[Any]:
+        """Summaries in id order (oldest first unless ``newest_first``), past the id cursor.
+
+        With ``fields`` only those columns (and the id) are loaded and the rows
+        are returned as mappings instead of ``Summary`` objects.
+        """
+        if fields is None:
+            statement = select(Summary)
+        else:
+            columns = dict.fromkeys(["id", *fields])
+            statement = select(*[getattr(Summary, column) for column in columns])
+        if cursor is not None:
+            statement = statement.where(Summary.id < cursor if newest_first else Summary.id > cursor)
+        order = Summary.id.desc() if newest_first else Summary.id
+        result = await db.execute(statement.order_by(order).offset(skip).limit(limit))
+        return result.scalars().all() if fields is None else result.mappings().all()
 
     async def get_by_url(self, db: AsyncSession, *, url: str) -> Optional[Summary]:
-        result = await db.execute(select(Summary).where(Summary.url == url))
+        result = await db.execute(select(Summary).where(Summary.url_hash == url_hash(url)))
         return result.scalar_one_or_none()
 
-    async def search_by_keyword(self, db: AsyncSession, *, keyword: str) -> List[Summary]:
+    async def get_multi_by_urls(self, db: AsyncSession, *, urls: List[str]) -> Dict[str, Summary]:
+        """Return the stored summary of each of the given URLs, keyed by the URL as given"""
+        hashes = {url_hash(url): url for url in urls}
+        result = await db.execute(select(Summary).where(Summary.url_hash.in_(hashes)))
+        return {hashes[summary.url_hash]: summary for summary in result.scalars().all()}
+
+    async def search_by_keyword(self, db: AsyncSession, *, keyword: str, prefix: bool = False,
+                                after_id: Optional[int] = None, limit: int = 100) -> List[Summary]:
+        """Summaries having the keyword (or a keyword starting with it), in id order after the after_id cursor"""
+        keyword = normalize_keyword(keyword)
+        if prefix and keyword:
+            # The range uses the (keyword, summary_id) index, the LIKE keeps the match exact under any collation
+            upper = keyword[:-1] + chr(ord(keyword[-1]) + 1)
+            match = [
+                SummaryKeyword.keyword >= keyword,
+                SummaryKeyword.keyword < upper,
+                SummaryKeyword.keyword.startswith(keyword, autoescape=True)
+            ]
+        else:
+            match = [SummaryKeyword.keyword == keyword]
+        matching_ids = select(SummaryKeyword.summary_id).where(*match)
+        if after_id is not None:
+            matching_ids = matching_ids.where(SummaryKeyword.summary_id > after_id)
         result = await db.execute(
-            select(Summary).where(Summary.keywords.contains(keyword))
+            select(Summary).where(Summary.id.in_(matching_ids)).order_by(Summary.id).limit(limit)
         )
         return result.scalars().all()
 
-    async def update(self, db: AsyncSession, *, db_obj: Summary, obj_in: SummaryUpdate) -> Summary:
+    async def search(self, db: AsyncSession, *, query: str, skip: int = 0, limit: int = 20) -> List[Summary]:
+        """Full-text search over summary texts and URLs, best matches first"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            match = fts5_query(query)
+            if match is None:
+                return []
+            statement = select(Summary).from_statement(
+                text(
+                    f"SELECT summaries.* FROM {SQLITE_FTS_TABLE} "
+                    f"JOIN summaries ON summaries.id = {SQLITE_FTS_TABLE}.rowid "
+                    f"WHERE {SQLITE_FTS_TABLE} MATCH :match "
+                    f"ORDER BY bm25({SQLITE_FTS_TABLE}) LIMIT :limit OFFSET :skip"
+                ).bindparams(match=match, limit=limit, skip=skip)
+            )
+        elif dialect == "postgresql":
+            search_vector = literal_column("summaries.search_vector")
+            ts_query = func.websearch_to_tsquery("english", query)
+            statement = (
+                select(Summary)
+                .where(search_vector.op("@@")(ts_query))
+                .order_by(func.ts_rank_cd(search_vector, ts_query).desc(), Summary.id)
+                .offset(skip).limit(limit)
+            )
+        else:
+            statement = (
+                select(Summary)
+                .where(or_(Summary.summary.contains(query), Summary.url.contains(query)))
+                .order_by(Summary.id).offset(skip).limit(limit)
+            )
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    async def update(self, db: AsyncSession, *, db_obj: Summary, obj_in: SummaryUpdate,
+                     summarized: bool = False) -> Summary:
+        """Apply the set fields of obj_in; ``summarized`` marks the summary text as freshly generated"""
         update_data = obj_in.model_dump(exclude_unset=True)
         if "url" in update_data:
             update_data["url"] = str(update_data["url"])
+            update_data["url_hash"] = url_hash(update_data["url"])
         
         for field, value in update_data.items():
             setattr(db_obj, field, value)
+        if summarized:
+            db_obj.summarized_at = func.now()
+        if "keywords" in update_data or "key_top" in update_data:
+            await self._index_keywords(db, [db_obj], replace=True)
         
         await db.commit()
         await db.refresh(db_obj)
@@ -52,6 +208,8 @@ class CRUDSummary:
     async def remove(self, db: AsyncSession, *, id: int) -> Optional[Summary]:
         db_obj = await self.get(db, id=id)
         if db_obj:
+            # Not left to ON DELETE CASCADE: SQLite does not enforce foreign keys by default
+            await db.execute(delete(SummaryKeyword).where(SummaryKeyword.summary_id == id))
             await db.execute(delete(Summary).where(Summary.id == id))
             await db.commit()
         return db_obj
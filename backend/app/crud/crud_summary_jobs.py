@@ -0,0 +1,124 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from app.models.summary import Summary
+from app.models.summary_job import SummaryJob, JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class CRUDSummaryJob:
+    async def enqueue(self, db: AsyncSession, *, summaries: List[Summary], max_attempts: int = 3,
+                      algorithm: str = "auto", n_sents: int = 5) -> List[SummaryJob]:
+        """Queue a generation job for each summary and commit together with any pending rows.
+
+        The summaries record the options they are being generated with.
+        """
+        now = utcnow()
+        for summary in summaries:
+            summary.algorithm, summary.n_sents = algorithm, n_sents
+        jobs = [
+            SummaryJob(
+                summary_id=summary.id,
+                url=summary.url,
+                state=JOB_QUEUED,
+                attempts=0,
+                max_attempts=max_attempts,
+                algorithm=algorithm,
+                n_sents=n_sents,
+                run_after=now
+            )
+            for summary in summaries
+        ]
+        db.add_all(jobs)
+        await db.commit()
+        return jobs
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[SummaryJob]:
+        result = await db.execute(select(SummaryJob).where(SummaryJob.id == id))
+        return result.scalar_one_or_none()
+
+    async def get_multi_with_summaries(self, db: AsyncSession, *, ids: List[int]) -> List[Tuple[SummaryJob, Summary]]:
+        result = await db.execute(
+            select(SummaryJob, Summary)
+            .join(Summary, Summary.id == SummaryJob.summary_id)
+            .where(SummaryJob.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        return result.all()
+
+    async def claim_next(self, db: AsyncSession, *, lease: float) -> Optional[SummaryJob]:
+        """Claim the next runnable job: a queued job that is due, or a running job whose lease expired.
+
+        The claim only succeeds if nobody changed the job since it was read, so
+        several workers (or processes) can poll the same table. The claimed job
+        carries a new ``lease_owner`` token that its completion must present.
+        """
+        now = utcnow()
+        result = await db.execute(
+            select(SummaryJob)
+            .where(SummaryJob.state.in_([JOB_QUEUED, JOB_RUNNING]), SummaryJob.run_after <= now)
+            .order_by(SummaryJob.run_after)
+            .limit(1)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            return None
+        claimed = await db.execute(
+            update(SummaryJob)
+            .where(
+                SummaryJob.id == job.id,
+                SummaryJob.state == job.state,
+                SummaryJob.attempts == job.attempts
+            )
+            .values(state=JOB_RUNNING, attempts=job.attempts + 1, run_after=now + timedelta(seconds=lease),
+                    lease_owner=uuid.uuid4().hex)
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return None
+        await db.refresh(job)
+        return job
+
+    async def _finish(self, db: AsyncSession, job: SummaryJob, commit: bool, **values) -> bool:
+        """Update a claimed job unless its lease was lost to another claim since; return whether it was"""
+        result = await db.execute(
+            update(SummaryJob)
+            .where(
+                SummaryJob.id == job.id,
+                SummaryJob.lease_owner == job.lease_owner,
+                SummaryJob.attempts == job.attempts
+            )
+            .values(lease_owner=None, **values)
+        )
+        if result.rowcount != 1:
+            await db.rollback()
+            return False
+        if commit:
+            await db.commit()
+        return True
+
+    async def mark_done(self, db: AsyncSession, *, job: SummaryJob, commit: bool = True) -> bool:
+        """Mark a claimed job done; False if it was reclaimed meanwhile (nothing is changed then)"""
+        return await self._finish(db, job, commit, state=JOB_DONE, last_error="")
+
+    async def mark_failed(self, db: AsyncSession, *, job: SummaryJob, error: str,
+                          retry_delay: float) -> Optional[str]:
+        """Queue the job again after retry_delay seconds, or fail it once out of attempts.
+
+        Returns the new state, or None if the job was reclaimed meanwhile.
+        """
+        if job.attempts < job.max_attempts:
+            values = {"state": JOB_QUEUED, "run_after": utcnow() + timedelta(seconds=retry_delay)}
+        else:
+            values = {"state": JOB_FAILED}
+        if not await self._finish(db, job, True, last_error=error, **values):
+            return None
+        return values["state"]
+
+
+crud_summary_job = CRUDSummaryJob()
@@ -0,0 +1,64 @@
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# SQLite: an FTS5 index over the summaries table, kept in sync by triggers
+SQLITE_FTS_TABLE = "summaries_fts"
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        url, summary, content='summaries', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_insert AFTER INSERT ON summaries BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, url, summary) VALUES (new.id, new.url, new.summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_delete AFTER DELETE ON summaries BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_update AFTER UPDATE OF url, summary ON summaries BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, url, summary)
+        VALUES ('delete', old.id, old.url, old.summary);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, url, summary) VALUES (new.id, new.url, new.summary);
+    END""",
+]
+
+# Postgres: a generated tsvector column (summary weighted above url) with a GIN index
+POSTGRES_DDL = [
+    """ALTER TABLE summaries ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(summary, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(url, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_summaries_search_vector ON summaries USING GIN (search_vector)",
+]
+
+
+def ensure_fulltext_index(connection: Connection) -> None:
+    """Create the full-text index of the summaries table if missing, indexing the existing rows"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SQLITE_FTS_TABLE}
+        ).first()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+
+def drop_fulltext_index(connection: Connection) -> None:
+    """Drop the index objects that do not go away with the summaries table"""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}"))
+
+
+def fts5_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching all its words, or None if it has none"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
@@ -1,4 +1,5 @@
 import sys
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -8,8 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.worker_pool import summarizer_pool, classifier_pool
+from app.core.fetcher import article_fetcher
+from app.core.job_queue import job_queue
 from app.db.session import engine
-from app.db.base_class import Base
 
 # Setup logging
 logging.basicConfig(
@@ -20,20 +23,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger("SummarizerMain")
 
+if settings.preload_models:
+    # Imported by the gunicorn master: workers inherit the loaded models copy-on-write
+    from app.core.summarizer import preload_models
+    preload_models(classifier=settings.warm_up_classifier)
+
+
+def log_warm_up_failure(task: asyncio.Task) -> None:
+    """Retrieve the outcome of the model warm-up so a failure is logged, not lost"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Models failed to load, /health reports failure: {task.exception()}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up ...")
     
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # The schema is managed by the alembic migrations (alembic upgrade head)
+    
+    # Start summarizer (and classifier) workers and load their models in the background (see /health)
+    pools = [summarizer_pool, classifier_pool] if settings.warm_up_classifier else [summarizer_pool]
+    warm_up_tasks = [
+        asyncio.ensure_future(pool.warm_up(attempts=settings.warm_up_attempts, retry_delay=settings.warm_up_retry_delay))
+        for pool in pools
+    ]
+    for task in warm_up_tasks:
+        task.add_done_callback(log_warm_up_failure)
+    
+    # Start URL summary job workers
+    job_queue.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down ...")
+    await job_queue.stop()
+    for task in warm_up_tasks:
+        task.cancel()
+    summarizer_pool.shutdown()
+    classifier_pool.shutdown()
+    await article_fetcher.aclose()
     await engine.dispose()
 
 
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, event
 from sqlalchemy.sql import func
 from app.db.base_class import Base
+from app.db.fulltext import ensure_fulltext_index, drop_fulltext_index
 
 
 class Summary(Base):
@@ -8,8 +9,19 @@ class Summary(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     url = Column(Text, nullable=False)
+    # SHA-256 of the normalized URL (app.core.urls.url_hash): one summary per URL
+    url_hash = Column(String(64), nullable=False, unique=True, index=True)
     summary = Column(Text, nullable=False)
     key_top = Column(Text, default="")
     keywords = Column(Text, default="")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Last time the summary text was generated by the job queue (edits don't change it)
+    summarized_at = Column(DateTime(timezone=True))
+    # Summarizer engine and length the summary text was requested with (None if unknown)
+    algorithm = Column(String(64))
+    n_sents = Column(Integer)
+
+# Keep the full-text index (see app/db/fulltext.py) in step with the table
+event.listen(Summary.__table__, "after_create", lambda target, connection, **kw: ensure_fulltext_index(connection))
+event.listen(Summary.__table__, "before_drop", lambda target, connection, **kw: drop_fulltext_index(connection))
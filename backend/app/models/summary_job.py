@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class SummaryJob(Base):
+    __tablename__ = "summary_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    summary_id = Column(Integer, nullable=False, index=True)
+    url = Column(Text, nullable=False)
+    state = Column(String(16), nullable=False, default=JOB_QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Summarizer engine and summary length requested for the summary
+    algorithm = Column(String(64), nullable=False, default="auto")
+    n_sents = Column(Integer, nullable=False, default=5)
+    # Queued: earliest time the job may run. Running: lease expiry, after which it is reclaimed
+    run_after = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Token of the current claim: only its holder may complete the job
+    lease_owner = Column(String(32))
+    last_error = Column(Text, default="")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
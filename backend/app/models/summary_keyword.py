@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, Text
+from app.db.base_class import Base
+
+
+class SummaryKeyword(Base):
+    """One normalized keyword of a summary, indexed for exact and prefix lookups"""
+    __tablename__ = "summary_keywords"
+
+    summary_id = Column(Integer, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True)
+    keyword = Column(Text, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_summary_keywords_keyword_summary_id", "keyword", "summary_id"),
+    )
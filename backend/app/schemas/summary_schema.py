@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, HttpUrl
+from typing import List, Optional
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
+
+from app.core.engines import get_engine
 
 
 class SummaryBase(BaseModel):
@@ -10,10 +12,26 @@ class SummaryBase(BaseModel):
     keywords: Optional[str] = ""
 
 
-class SummaryCreate(SummaryBase):
+class SummarizerOptions(BaseModel):
+    """Summarization engine (see GET /summaries/algorithms) and summary length of a request"""
+    algorithm: str = "auto"
+    n_sents: int = Field(5, gt=0, le=100)
+
+    @field_validator("algorithm")
+    @classmethod
+    def check_algorithm(cls, value: str) -> str:
+        # Engines are registered by app.core.summarizer, which the API imports
+        return get_engine(value).name
+
+
+class SummaryCreate(SummaryBase, SummarizerOptions):
     pass
 
 
+class SummaryBulkCreate(SummarizerOptions):
+    urls: List[HttpUrl] = Field(..., min_length=1, max_length=1000)
+
+
 class SummaryUpdate(SummaryBase):
     url: Optional[HttpUrl] = None
 
@@ -22,6 +40,9 @@ class SummaryInDBBase(SummaryBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    summarized_at: Optional[datetime] = None
+    algorithm: Optional[str] = None
+    n_sents: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -35,11 +56,65 @@ class SummaryInDB(SummaryInDBBase):
     pass
 
 
+class SummaryFields(BaseModel):
+    """A summary restricted to the requested fields (unrequested ones are left out of the response)"""
+    id: Optional[int] = None
+    url: Optional[HttpUrl] = None
+    summary: Optional[str] = None
+    key_top: Optional[str] = None
+    keywords: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    summarized_at: Optional[datetime] = None
+    algorithm: Optional[str] = None
+    n_sents: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Text-only summary schemas
-class SummaryFromTextCreate(BaseModel):
+class SummaryFromTextCreate(SummarizerOptions):
     text: str
+    # Deprecated: use algorithm="abstractive"
+    abstractive: bool = False
+    # Latency budget: cheaper algorithms are used when the requested one would not fit
+    budget_ms: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def apply_abstractive(self) -> "SummaryFromTextCreate":
+        if self.abstractive:
+            if self.algorithm not in ("auto", "abstractive"):
+                raise ValueError(f"abstractive conflicts with algorithm {self.algorithm}")
+            self.algorithm = "abstractive"
+        return self
 
 
 class SummaryFromTextResponse(BaseModel):
     text: str
-    summary: str
\ No newline at end of file
+    summary: str
+    # Algorithm that produced the summary: "auto" resolves to the one it runs,
+    # and a failing or too slow algorithm is replaced by a cheaper one
+    tier: str
+
+
+class SummarizerEngineInfo(BaseModel):
+    name: str
+    cost: str
+    complexity: str
+    chars_per_second: float
+    description: str
+
+
+class SummaryFromStreamResponse(BaseModel):
+    summary: str
+    sentences: int
+
+
+class SummariesFromTextsCreate(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=10000)
+    n_sents: int = Field(5, gt=0)
+
+
+class SummariesFromTextsResponse(BaseModel):
+    summaries: List[str]
\ No newline at end of file
@@ -0,0 +1,23 @@
+import logging
+import multiprocessing
+import os
+
+# Load the models once in the master and share them copy-on-write with the
+# forked workers. Inference then runs in a thread pool inside each worker:
+# a per-worker process pool would load its own copy of the models again.
+os.environ.setdefault("PRELOAD_MODELS", "1")
+os.environ.setdefault("SUMMARIZER_WORKERS", "0")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def post_fork(server, worker):
+    from app.core.memory import process_memory
+    usage = process_memory()
+    logger.info(f"Worker {worker.pid} started, memory: {usage}")
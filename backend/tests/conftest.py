@@ -1,21 +1,27 @@
+import os
+import tempfile
+
+# Run summarization jobs in threads so tests don't spawn worker processes
+os.environ.setdefault("SUMMARIZER_WORKERS", "0")
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.session import get_db
+from app.core.job_queue import job_queue
 from app.db.base_class import Base
 
-# Test database URL (in-memory SQLite for testing)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Test database URL (temporary SQLite file, so that concurrent sessions
+# such as the job workers' get their own connections)
+TEST_DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
 
 # Create test engine
 test_engine = create_async_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 
 # Create test session factory
@@ -49,6 +55,21 @@ async def db_session():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture
+def session_factory():
+    return TestSessionLocal
+
+
+@pytest_asyncio.fixture
+async def job_workers(db_session, monkeypatch):
+    """Run the URL summary job workers against the test database"""
+    monkeypatch.setattr(job_queue, "session_factory", TestSessionLocal)
+    monkeypatch.setattr(job_queue, "poll_interval", 0.05)
+    job_queue.start()
+    yield job_queue
+    await job_queue.stop()
+
+
 @pytest_asyncio.fixture
 async def client(db_session):
     app.dependency_overrides[get_db] = lambda: db_session
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.fetcher import ArticleFetcher, FetchError
+
+ARTICLE_HTML = b"<html><body><p>The central bank raised rates.</p></body></html>"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        StubHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/big":
+            body = b"x" * 2048
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(ARTICLE_HTML)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(ARTICLE_HTML)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_uses_conditional_get(stub_server):
+    """Test that a refetch sends the ETag and reuses the cached body on 304"""
+    fetcher = ArticleFetcher()
+    try:
+        first = await fetcher.fetch(f"{stub_server}/article")
+        second = await fetcher.fetch(f"{stub_server}/article")
+    finally:
+        await fetcher.aclose()
+
+    assert first == second == ARTICLE_HTML.decode()
+    assert StubHandler.requests == [("/article", None), ("/article", '"v1"')]
+
+
+@pytest.mark.asyncio
+async def test_fetch_bounds_cached_pages_and_host_limits(stub_server):
+    """Test that cached pages stay within the character budget and idle hosts are forgotten"""
+    fetcher = ArticleFetcher(cache_chars=2 * len(ARTICLE_HTML))
+    try:
+        for path in ("/a", "/b", "/c"):
+            await fetcher.fetch(f"{stub_server}{path}")
+    finally:
+        await fetcher.aclose()
+
+    assert list(fetcher._validators) == [f"{stub_server}/b", f"{stub_server}/c"]
+    assert fetcher._cached_chars == 2 * len(ARTICLE_HTML)
+    assert fetcher._host_limits == {}
+
+
+def test_fetch_closes_client_of_previous_event_loop(stub_server):
+    """Test that the client of another event loop is closed when it is replaced"""
+    fetcher = ArticleFetcher()
+    asyncio.run(fetcher.fetch(f"{stub_server}/article"))
+    first_client = fetcher._client
+
+    async def fetch_again():
+        try:
+            await fetcher.fetch(f"{stub_server}/other")
+        finally:
+            await fetcher.aclose()
+
+    asyncio.run(fetch_again())
+    assert first_client.is_closed
+    assert fetcher._client is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_rejects_oversized_body(stub_server):
+    """Test that responses over the size cap are aborted"""
+    fetcher = ArticleFetcher(max_bytes=1024)
+    try:
+        with pytest.raises(FetchError):
+            await fetcher.fetch(f"{stub_server}/big")
+    finally:
+        await fetcher.aclose()
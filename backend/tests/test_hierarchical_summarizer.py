@@ -0,0 +1,73 @@
+import pytest
+
+from app.core import hierarchical_summarizer, scoring
+from app.core.config import settings
+from app.core.hierarchical_summarizer import hierarchical_summary, split_sections
+from app.core.stream_summarizer import StreamingSummarizer
+from app.core.summarizer import generate_summary_from_text, get_sentence_terms
+
+
+def test_split_sections_cuts_at_sentence_ends():
+    """Test that sections cover the text, within the size limit, ending on sentences"""
+    text = " ".join(f"Sentence number {i} is here." for i in range(100))
+    sections = split_sections(text, 200)
+    assert "".join(sections) == text
+    assert all(len(section) <= 200 for section in sections)
+    assert all(section.endswith(". ") for section in sections[:-1])
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summary_matches_single_pass(monkeypatch):
+    """Test that section-wise selection picks what a pass over the whole text picks"""
+    monkeypatch.setattr(settings, "hierarchical_section_chars", 1000)
+    monkeypatch.setattr(settings, "hierarchical_candidates", 4)
+    sentences = [f"Weather report {i} mentions calm winds today." for i in range(200)]
+    sentences[30] = "Weather report mentions calm winds today and calm winds tomorrow."
+    sentences[170] = "Calm winds, calm weather: the report mentions calm winds today."
+    text = " ".join(sentences)
+
+    runs = []
+    real_run = hierarchical_summarizer.summarizer_pool.run
+
+    async def counting_run(fn, *args, **kwargs):
+        runs.append(fn.__name__)
+        return await real_run(fn, *args, **kwargs)
+
+    monkeypatch.setattr(hierarchical_summarizer.summarizer_pool, "run", counting_run)
+    summary, tier = await hierarchical_summary(text, n_sents=2)
+
+    single_pass = StreamingSummarizer(2, max_candidates=len(sentences))
+    single_pass.add(*get_sentence_terms(text))
+    assert summary == single_pass.summary() == " ".join([sentences[30], sentences[170]])
+    # One job per section, then the final selection: none of it runs on the event loop
+    assert runs == ["select_section_candidates"] * len(split_sections(text, 1000)) + ["select_sentences"]
+    assert len(runs) > 2
+    assert tier == "hierarchical:frequency"
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summary_uses_scoring_method(monkeypatch):
+    """Test that sections and the final pick are scored with the configured method"""
+    monkeypatch.setattr(settings, "hierarchical_section_chars", 1000)
+    monkeypatch.setattr(settings, "hierarchical_candidates", 4)
+    monkeypatch.setattr(settings, "scoring_method", "tfidf")
+    methods = []
+    real_score_sentences = scoring.score_sentences
+
+    def recording_score_sentences(sentence_terms, method="frequency", significant_words=None):
+        methods.append(method)
+        return real_score_sentences(sentence_terms, method, significant_words)
+
+    monkeypatch.setattr(scoring, "score_sentences", recording_score_sentences)
+    text = " ".join(f"Report {i} on the {i % 7} rivers and {i % 5} lakes of the valley." for i in range(200))
+    summary, tier = await hierarchical_summary(text, n_sents=2)
+    assert tier == "hierarchical:tfidf"
+    assert summary
+    assert methods and set(methods) == {"tfidf"}
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summary_short_text_is_single_pass():
+    """Test that a text of one section gets the regular summary"""
+    text = "Cats sleep a lot during the day. Dogs like to play fetch outside. Birds sing in the morning."
+    assert await hierarchical_summary(text, n_sents=2) == generate_summary_from_text(text, n_sents=2)
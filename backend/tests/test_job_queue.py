@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import job_queue as job_queue_module
+from app.core.job_queue import JobQueue
+from app.crud.crud_summaries import crud_summary
+from app.crud.crud_summary_jobs import crud_summary_job
+from app.models.summary_job import JOB_DONE, JOB_FAILED, JOB_RUNNING
+from app.schemas.summary_schema import SummaryCreate, SummaryUpdate
+
+
+async def queue_summary(db_session: AsyncSession, queue: JobQueue, url: str):
+    summary = await crud_summary.create(db_session, obj_in=SummaryCreate(url=url), commit=False)
+    jobs = await queue.enqueue(db_session, summaries=[summary])
+    return summary.id, jobs[0].id
+
+
+@pytest.mark.asyncio
+async def test_job_is_retried_until_it_succeeds(db_session: AsyncSession, session_factory, monkeypatch):
+    """Test that a failing job is queued again and its summary written once it succeeds"""
+    calls = []
+
+    async def flaky_generate_summary_content(url, **options):
+        calls.append(url)
+        if len(calls) == 1:
+            raise RuntimeError("temporary failure")
+        return SummaryUpdate(summary="Generated summary", key_top="science", keywords="")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", flaky_generate_summary_content)
+    queue = JobQueue(session_factory=session_factory, retry_backoff=0)
+    summary_id, job_id = await queue_summary(db_session, queue, "https://example.com/flaky")
+
+    assert await queue.run_pending() == 2
+
+    db_session.expire_all()
+    job = await crud_summary_job.get(db_session, id=job_id)
+    assert job.state == JOB_DONE
+    assert job.attempts == 2
+    summary = await crud_summary.get(db_session, id=summary_id)
+    assert summary.summary == "Generated summary"
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(db_session: AsyncSession, session_factory, monkeypatch):
+    """Test that a job is marked failed once it runs out of attempts"""
+    async def failing_generate_summary_content(url, **options):
+        raise RuntimeError("permanent failure")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", failing_generate_summary_content)
+    queue = JobQueue(session_factory=session_factory, max_attempts=2, retry_backoff=0)
+    _, job_id = await queue_summary(db_session, queue, "https://example.com/broken")
+
+    assert await queue.run_pending() == 2
+
+    db_session.expire_all()
+    job = await crud_summary_job.get(db_session, id=job_id)
+    assert job.state == JOB_FAILED
+    assert job.last_error == "permanent failure"
+
+
+@pytest.mark.asyncio
+async def test_expired_running_job_is_reclaimed(db_session: AsyncSession, session_factory, monkeypatch):
+    """Test that a job left running by a crashed worker is picked up again"""
+    async def fake_generate_summary_content(url, **options):
+        return SummaryUpdate(summary="Recovered summary", key_top="", keywords="")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", fake_generate_summary_content)
+    queue = JobQueue(session_factory=session_factory, lease=0)
+    _, job_id = await queue_summary(db_session, queue, "https://example.com/crash")
+
+    # Simulate a worker that claimed the job and died
+    async with session_factory() as db:
+        assert await crud_summary_job.claim_next(db, lease=0) is not None
+
+    assert await queue.run_pending() == 1
+
+    db_session.expire_all()
+    job = await crud_summary_job.get(db_session, id=job_id)
+    assert job.state == JOB_DONE
+    assert job.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_job_reclaimed_during_inference_is_not_completed_twice(db_session: AsyncSession, session_factory):
+    """Test that a worker whose lease was taken over cannot complete or fail the job"""
+    queue = JobQueue(session_factory=session_factory, lease=0)
+    _, job_id = await queue_summary(db_session, queue, "https://example.com/slow")
+
+    async with session_factory() as db:
+        stale_claim = await crud_summary_job.claim_next(db, lease=0)
+    async with session_factory() as db:
+        current_claim = await crud_summary_job.claim_next(db, lease=60)
+    assert current_claim.lease_owner != stale_claim.lease_owner
+
+    async with session_factory() as db:
+        assert not await crud_summary_job.mark_done(db, job=stale_claim)
+        assert await crud_summary_job.mark_failed(db, job=stale_claim, error="late", retry_delay=0) is None
+
+    db_session.expire_all()
+    job = await crud_summary_job.get(db_session, id=job_id)
+    assert (job.state, job.attempts, job.lease_owner) == (JOB_RUNNING, 2, current_claim.lease_owner)
+
+    async with session_factory() as db:
+        assert await crud_summary_job.mark_done(db, job=current_claim)
+    db_session.expire_all()
+    job = await crud_summary_job.get(db_session, id=job_id)
+    assert (job.state, job.lease_owner) == (JOB_DONE, None)
+
+
+@pytest.mark.asyncio
+async def test_workers_do_not_hold_connections_during_inference(db_session: AsyncSession, monkeypatch):
+    """Test that more workers than pool connections can run jobs without exhausting the pool"""
+    engine = create_async_engine(
+        db_session.bind.url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    started = []
+
+    async def slow_generate_summary_content(url, **options):
+        started.append(url)
+        await asyncio.sleep(0.5)
+        return SummaryUpdate(summary=f"Summary of {url}", key_top="", keywords="")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", slow_generate_summary_content)
+    queue = JobQueue(
+        session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        workers=8,
+        poll_interval=0.05,
+    )
+    job_ids = [(await queue_summary(db_session, queue, f"https://example.com/{i}"))[1] for i in range(8)]
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    elapsed = None
+    queue.start()
+    try:
+        for _ in range(50):
+            db_session.expire_all()
+            jobs = [await crud_summary_job.get(db_session, id=job_id) for job_id in job_ids]
+            if all(job.state == JOB_DONE for job in jobs):
+                elapsed = loop.time() - start
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        await queue.stop()
+        await engine.dispose()
+
+    assert elapsed is not None, f"Jobs not done after 5s: {[job.state for job in jobs]}"
+    assert all(job.attempts == 1 for job in jobs)
+    assert len(started) == 8
+    # All 8 inferences overlap: holding a connection each would serialize them 2 at a time
+    assert elapsed < 1.5
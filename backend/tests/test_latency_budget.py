@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.core import latency_budget as latency_budget_module
+from app.core.engines import degradation_ladder, get_engine
+from app.core.latency_budget import LatencyBudget
+from app.core.summarizer import lead_summary
+
+TEXT = ("The central bank raised interest rates again this week. Markets reacted calmly to the bank decision. "
+        "It rained in the afternoon. The bank governor said rates could rise again.")
+
+
+@pytest.mark.asyncio
+async def test_budget_learns_from_the_engine_that_ran(monkeypatch):
+    """Test that a summary within budget reports its tier and updates that engine's estimate"""
+    frequency = get_engine("frequency")
+    estimate = frequency.chars_per_second
+    monkeypatch.setattr(frequency, "chars_per_second", estimate)
+
+    async def direct_run(fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(latency_budget_module.summarizer_pool, "run", direct_run)
+    summary, tier = await LatencyBudget().summarize(TEXT, 2, "frequency", budget=10)
+    assert summary and tier == "frequency"
+    assert frequency.chars_per_second != estimate
+
+
+@pytest.mark.asyncio
+async def test_budget_sheds_load(monkeypatch):
+    """Test that hopeless budgets and running orphaned jobs skip the pool"""
+    runs = []
+
+    async def slow_run(fn, *args, **kwargs):
+        runs.append(fn.__name__)
+        await asyncio.sleep(0.2)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(latency_budget_module.summarizer_pool, "run", slow_run)
+    budget = LatencyBudget(max_orphans=1)
+    lead = (lead_summary(TEXT, 2), "lead")
+
+    # No algorithm but lead can summarize the text in a microsecond
+    assert await budget.summarize(TEXT, 2, "frequency", budget=1e-6) == lead
+    assert runs == []
+
+    assert await budget.summarize(TEXT, 2, "frequency", budget=0.05) == lead
+    assert runs == ["generate_summary_within_budget"] and budget.orphans == 1
+    # The orphaned job still runs: the next request does not queue another one
+    assert await budget.summarize(TEXT, 2, "frequency", budget=0.05) == lead
+    assert len(runs) == 1
+
+    await asyncio.wait(set(budget._orphans))
+    assert budget.orphans == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_estimates_the_engine_auto_resolves_to(monkeypatch):
+    """Test that the pre-check builds the ladder of the engine "auto" runs, not of "auto" itself"""
+    ladders = []
+
+    def recording_ladder(name, speeds=None):
+        ladders.append(name)
+        return degradation_ladder(name, speeds)
+
+    monkeypatch.setattr(latency_budget_module, "degradation_ladder", recording_ladder)
+    monkeypatch.setattr(latency_budget_module, "resolve_engine", lambda name: get_engine("frequency"))
+    assert await LatencyBudget().summarize(TEXT, 2, "auto", budget=1e-6) == (lead_summary(TEXT, 2), "lead")
+    assert ladders == ["frequency"]
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+
+from alembic import command
+from alembic.config import Config
+
+from app.core.urls import url_hash
+from app.db.base_class import Base
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(db_path: str) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_path}")
+    return config
+
+
+def table_columns(db_path: str) -> dict:
+    with sqlite3.connect(db_path) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return {
+            table: {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for table in tables if not table.startswith(("summaries_fts", "alembic_", "sqlite_"))
+        }
+
+
+def test_migrations_create_the_model_schema(tmp_path):
+    db_path = str(tmp_path / "migrated.db")
+    config = alembic_config(db_path)
+    command.upgrade(config, "head")
+    assert table_columns(db_path) == {
+        table.name: {column.name for column in table.columns} for table in Base.metadata.sorted_tables
+    }
+
+    command.downgrade(config, "base")
+    assert table_columns(db_path) == {}
+
+
+def test_migrations_upgrade_database_created_without_them(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as conn:
+        # Schema created by Base.metadata.create_all before the migrations existed
+        conn.execute(
+            "CREATE TABLE summaries (id INTEGER PRIMARY KEY, url TEXT NOT NULL, summary TEXT NOT NULL, "
+            "key_top TEXT, keywords TEXT, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), updated_at DATETIME)"
+        )
+        conn.executemany(
+            "INSERT INTO summaries (url, summary, key_top, keywords) VALUES (?, ?, ?, ?)",
+            [("https://example.com/a", "Old", "Politics", ""),
+             ("https://Example.com/a#top", "New", "science", "history"),
+             ("https://example.com/b", "Other", "", "")]
+        )
+
+    command.upgrade(alembic_config(db_path), "head")
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT version_num FROM alembic_version").fetchone() is not None
+        rows = conn.execute("SELECT id, summary, url_hash FROM summaries ORDER BY id").fetchall()
+        assert rows == [(2, "New", url_hash("https://example.com/a")), (3, "Other", url_hash("https://example.com/b"))]
+        # Keywords of stored summaries are indexed, without those of the removed duplicates
+        assert conn.execute("SELECT summary_id, keyword FROM summary_keywords ORDER BY keyword").fetchall() == [
+            (2, "history"), (2, "science")
+        ]
+        # The full-text index survives the table being rebuilt
+        assert conn.execute("SELECT rowid FROM summaries_fts WHERE summaries_fts MATCH 'other'").fetchall() == [(3,)]
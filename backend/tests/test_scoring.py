@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.core import summarizer
+from app.core.scoring import score_sentences, top_k_indices, randomized_svd, lsa_scores
+
+SENTENCE_TERMS = [
+    ["bank", "raise", "rate"],
+    ["market", "react", "bank", "announcement"],
+    ["weather", "sunny"],
+    ["bank", "governor", "defend", "rate", "inflation"],
+    ["football", "team", "win"],
+]
+SIGNIFICANT_WORDS = ["bank", "bank", "bank", "rate", "rate", "market", "inflation", "weather", "team"]
+
+
+def test_frequency_scores_match_dictionary_scoring():
+    """Test that the matrix scoring gives the scores of the per-token dictionary loops"""
+    counts = Counter(SIGNIFICANT_WORDS)
+    max_freq = max(counts.values())
+    expected = [sum(counts[term] / max_freq for term in terms) for terms in SENTENCE_TERMS]
+
+    scores = score_sentences(SENTENCE_TERMS, method="frequency", significant_words=SIGNIFICANT_WORDS)
+
+    np.testing.assert_allclose(scores, expected)
+    # Word counts score the same as the words they count
+    np.testing.assert_allclose(
+        score_sentences(SENTENCE_TERMS, method="frequency", significant_words=Counter(SIGNIFICANT_WORDS)), expected
+    )
+
+
+def test_top_k_indices_keeps_document_order_and_breaks_ties_by_position():
+    """Test that top-k selection returns sentence indices in order with stable tie breaking"""
+    scores = np.array([0.5, 2.0, 1.0, 2.0, 1.0, 1.0])
+
+    assert top_k_indices(scores, 3).tolist() == [1, 2, 3]
+    assert top_k_indices(scores, 4).tolist() == [1, 2, 3, 4]
+    assert top_k_indices(scores, 10).tolist() == [0, 1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("method", ["tfidf", "textrank"])
+def test_alternative_scoring_methods_favour_central_sentences(method):
+    """Test that TF-IDF and TextRank rank the sentences sharing terms above isolated ones"""
+    scores = score_sentences(SENTENCE_TERMS, method=method)
+
+    assert scores.shape == (len(SENTENCE_TERMS),)
+    assert scores[3] > scores[2]
+    if method == "textrank":
+        assert scores.sum() == pytest.approx(1.0)
+        assert scores[3] > scores[4]
+
+
+def test_unknown_scoring_method():
+    with pytest.raises(ValueError):
+        score_sentences(SENTENCE_TERMS, method="random")
+
+
+def test_randomized_svd_matches_full_svd():
+    """Test that the randomized SVD recovers the top singular values"""
+    rng = np.random.default_rng(1)
+    matrix = rng.random((60, 8)) @ rng.random((8, 40)) + 0.01 * rng.random((60, 40))
+    u, s, vt = randomized_svd(matrix, 5)
+    expected = np.linalg.svd(matrix, compute_uv=False)[:5]
+    assert u.shape == (60, 5) and vt.shape == (5, 40)
+    np.testing.assert_allclose(s, expected, rtol=1e-6)
+
+
+def test_lsa_scores_match_dense_lsa_with_all_dimensions():
+    """Test the sparse LSA ranks against sumy's dense computation when no dimension is dropped"""
+    from sumy.summarizers.lsa import LsaSummarizer
+    vocabulary = sorted({term for terms in SENTENCE_TERMS for term in terms})
+    dense = np.zeros((len(vocabulary), len(SENTENCE_TERMS)))
+    for col, terms in enumerate(SENTENCE_TERMS):
+        for term in terms:
+            dense[vocabulary.index(term), col] += 1
+    lsa = LsaSummarizer()
+    _, sigma, v = np.linalg.svd(lsa._compute_term_frequency(dense), full_matrices=False)
+    expected = lsa._compute_ranks(sigma, v)
+
+    np.testing.assert_allclose(lsa_scores(SENTENCE_TERMS, k=len(SENTENCE_TERMS)), expected, rtol=1e-6)
+
+
+def test_lsa_summarizer_returns_sentences_in_document_order():
+    """Test the LSA engine behind extractive_summary_lsa on a parsed sumy document"""
+    from sumy.models.dom import ObjectDocumentModel, Paragraph, Sentence
+
+    class WordTokenizer:
+        language = summarizer.LANGUAGE
+
+        def to_words(self, sentence):
+            return re.findall(r"\w+", sentence)
+
+    texts = ["The central bank raised rates again.", "Markets reacted to the bank announcement.",
+             "It was sunny.", "The bank governor defended the rate rise against inflation.",
+             "The football team won."]
+    document = ObjectDocumentModel([Paragraph([Sentence(text, WordTokenizer()) for text in texts])])
+    sentences = summarizer.load_lsa_summarizer()(document, 2)
+    assert len(sentences) == 2
+    positions = [document.sentences.index(sentence) for sentence in sentences]
+    assert positions == sorted(positions)
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+
+from app.core.single_flight import SingleFlight
+from app.api.v1.endpoints import summaries as summaries_endpoints
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls with one key share a single computation"""
+    flights = SingleFlight()
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value * 2
+
+    results = await asyncio.gather(*[flights.do("a", compute, 21) for _ in range(10)], flights.do("b", compute, 1))
+    assert results == [42] * 10 + [2]
+    assert calls == [21, 1]
+    assert flights.in_flight == 0
+
+    assert await flights.do("a", compute, 5) == 10
+    assert calls == [21, 1, 5]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_waiter_cancellation():
+    """Test that cancelling one waiter leaves the shared computation running"""
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    first = asyncio.ensure_future(flights.do("key", compute))
+    second = asyncio.ensure_future(flights.do("key", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(ValueError):
+        await second
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_identical_text_requests_share_inference(client: AsyncClient, monkeypatch):
+    """Test that concurrent /text requests for the same text run one inference"""
+    calls = []
+
+    async def fake_run(fn, text, *args, **kwargs):
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        return "Shared summary.", "frequency"
+
+    monkeypatch.setattr(summaries_endpoints.summarizer_pool, "run", fake_run)
+    responses = await asyncio.gather(*[
+        client.post("/api/v1/summaries/text", json={"text": "Same text.  "}) for _ in range(5)
+    ], client.post("/api/v1/summaries/text", json={"text": "Other text."}))
+
+    assert [r.json()["summary"] for r in responses] == ["Shared summary."] * 6
+    assert sorted(calls) == ["Other text.", "Same text.  "]
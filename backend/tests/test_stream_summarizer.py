@@ -0,0 +1,47 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.stream_summarizer import StreamingSummarizer, split_complete_text
+
+
+def test_split_complete_text_keeps_unfinished_sentence():
+    """Test that blocks end after the last complete sentence"""
+    assert split_complete_text('One. "Two!" Thr') == ('One. "Two!" ', 'Thr')
+    assert split_complete_text("no sentence end yet") == ("no sentence end ", "yet")
+    assert split_complete_text("x" * 10) == ("x" * 10, "")
+
+
+def test_streaming_summarizer_keeps_bounded_candidates():
+    """Test that the candidate pool stays bounded and the summary follows the final frequencies"""
+    summarizer = StreamingSummarizer(n_sents=2, max_candidates=4)
+    filler = [(f"Filler sentence number {i} here.", ["filler", f"n{i}"]) for i in range(50)]
+    summarizer.add(filler, {"filler": 50})
+    summarizer.add([("Rockets launch from the spaceport.", ["rocket", "launch", "spaceport"]),
+                    ("Rockets and launch pads matter.", ["rocket", "launch", "pad"])],
+                   {"rocket": 200, "launch": 200})
+
+    assert len(summarizer._candidates) == 4
+    assert summarizer.n_sentences == 52
+    assert summarizer.summary() == "Rockets launch from the spaceport. Rockets and launch pads matter."
+
+
+@pytest.mark.asyncio
+async def test_create_summary_from_text_stream(client: AsyncClient, monkeypatch):
+    """Test summarizing a chunked upload much larger than a parsing block"""
+    monkeypatch.setattr(settings, "stream_block_chars", 500)
+    monkeypatch.setattr(settings, "stream_candidates", 8)
+    sentences = [f"Weather report {i} mentions calm winds today." for i in range(300)]
+    sentences[150] = "Weather report mentions calm winds today and calm winds tomorrow."
+    sentences[250] = "Calm winds, calm weather: the report mentions calm winds today."
+    body = " ".join(sentences).encode()
+
+    async def chunks():
+        for start in range(0, len(body), 97):
+            yield body[start:start + 97]
+
+    response = await client.post("/api/v1/summaries/text/stream", params={"n_sents": 2}, content=chunks())
+    assert response.status_code == 201
+    data = response.json()
+    assert data["sentences"] == 300
+    assert data["summary"] == " ".join([sentences[150], sentences[250]])
@@ -1,9 +1,26 @@
+import asyncio
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.crud_summaries import crud_summary
-from app.schemas.summary_schema import SummaryCreate
+from app.core.worker_pool import summarizer_pool
+from app.core.latency_budget import latency_budget
+from app.schemas.summary_schema import SummaryCreate, SummaryUpdate
+from app.core import job_queue as job_queue_module
+
+
+async def wait_until(condition, timeout: float = 2.5) -> None:
+    """Poll condition() until it holds, failing the test once timeout seconds have passed"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, f"Condition still false after {timeout}s"
+        await asyncio.sleep(0.05)
 
 
 @pytest.mark.asyncio
@@ -20,6 +37,16 @@ async def test_create_summary_from_text(client: AsyncClient):
     assert len(data["summary"]) > 0
 
 
+@pytest.mark.asyncio
+async def test_create_summary_from_text_pool_saturated(client: AsyncClient, monkeypatch):
+    """Test that text summaries are rejected when the worker pool is full"""
+    monkeypatch.setattr(summarizer_pool, "max_pending", 0)
+    payload = {"text": "This is a test text for summarization. It contains multiple sentences."}
+    response = await client.post("/api/v1/summaries/text", json=payload)
+    
+    assert response.status_code == 429
+
+
 @pytest.mark.asyncio
 async def test_create_summary_from_url(client: AsyncClient):
     """Test creating summary from URL"""
@@ -103,4 +130,312 @@ async def test_health_check(client: AsyncClient):
     """Test health check endpoint"""
     response = await client.get("/api/v1/ping")
     assert response.status_code == 200
-    assert response.json() == {"ping": "pong!"}
\ No newline at end of file
+    assert response.json() == {"ping": "pong!"}
+
+
+@pytest.mark.asyncio
+async def test_create_summaries_bulk(client: AsyncClient, db_session: AsyncSession, job_workers, monkeypatch):
+    """Test bulk URL summarization streams one event per URL"""
+    existing = await crud_summary.create(
+        db_session, obj_in=SummaryCreate(url="https://example.com/cached", summary="Cached summary")
+    )
+
+    async def fake_generate_summary_content(url, **options):
+        return SummaryUpdate(summary=f"Summary of {url}", key_top="science", keywords="technology")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", fake_generate_summary_content)
+    urls = ["https://example.com/cached", "https://example.com/a", "https://example.com/b", "https://example.com/a"]
+    response = await client.post("/api/v1/summaries/bulk", json={"urls": urls})
+
+    assert response.status_code == 201
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert len(events) == 3
+    assert events[0] == {
+        "id": existing.id, "url": "https://example.com/cached", "status": "cached",
+        "summary": "Cached summary", "key_top": "", "keywords": ""
+    }
+    done = {event["url"]: event for event in events[1:]}
+    assert set(done) == {"https://example.com/a", "https://example.com/b"}
+    assert all(event["status"] == "done" for event in done.values())
+
+    assert done["https://example.com/a"]["summary"] == "Summary of https://example.com/a"
+    db_session.expire_all()
+    stored = await crud_summary.get(db_session, id=done["https://example.com/a"]["id"])
+    assert stored.summary == "Summary of https://example.com/a"
+    assert stored.key_top == "science"
+    assert stored.summarized_at is not None
+
+
+@pytest.mark.asyncio
+async def test_edited_stale_summary_is_regenerated(client: AsyncClient, db_session: AsyncSession, job_workers,
+                                                   monkeypatch):
+    """Test that editing a stale summary does not make it look freshly generated"""
+    stale = await crud_summary.create(
+        db_session, obj_in=SummaryCreate(url="https://example.com/stale", summary="Old summary")
+    )
+    stale.created_at = stale.summarized_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    await db_session.commit()
+    response = await client.put(f"/api/v1/summaries/{stale.id}/", json={"keywords": "history"})
+    assert response.status_code == 200
+
+    async def fake_generate_summary_content(url, **options):
+        return SummaryUpdate(summary="New summary", key_top="", keywords="")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", fake_generate_summary_content)
+    response = await client.post("/api/v1/summaries/bulk", json={"urls": ["https://example.com/stale"]})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [(event["status"], event["summary"]) for event in events] == [("done", "New summary")]
+
+
+@pytest.mark.asyncio
+async def test_create_summaries_from_texts(client: AsyncClient):
+    """Test batch summarization of plain texts"""
+    texts = [f"This is test text number {i}. It contains multiple sentences to summarize." for i in range(3)]
+    response = await client.post("/api/v1/summaries/text/batch", json={"texts": texts})
+
+    assert response.status_code == 201
+    summaries = response.json()["summaries"]
+    assert len(summaries) == 3
+    assert all(f"number {i}" in summary for i, summary in enumerate(summaries))
+
+
+@pytest.mark.asyncio
+async def test_readiness_check(client: AsyncClient, monkeypatch):
+    """Test readiness reporting before and after the models are warmed up"""
+    monkeypatch.setattr(summarizer_pool, "ready", False)
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 503
+
+    await summarizer_pool.warm_up()
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_check_warm_up_failure(client: AsyncClient, monkeypatch):
+    """Test that warm-up is retried, skips the pending limit, and reports a lasting failure"""
+    from app.core import summarizer
+    calls = []
+
+    def failing_warm_up(classifier=False):
+        calls.append(classifier)
+        raise OSError("model not found")
+
+    monkeypatch.setattr(summarizer_pool, "ready", False)
+    monkeypatch.setattr(summarizer_pool, "max_pending", 0)
+    monkeypatch.setattr(summarizer, "warm_up", failing_warm_up)
+    with pytest.raises(OSError):
+        await summarizer_pool.warm_up(attempts=2)
+    assert len(calls) == 2
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 503
+    assert response.json() == {"status": "failed", "detail": "model not found"}
+
+    monkeypatch.setattr(summarizer, "warm_up", lambda classifier=False: None)
+    await summarizer_pool.warm_up()
+    assert summarizer_pool.warm_up_error is None
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_worker_memory_metric(client: AsyncClient):
+    """Test the per-worker memory report"""
+    response = await client.get("/api/v1/health/memory")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pid"] == os.getpid()
+    assert data["rss"] > 0
+    if "pss" in data:
+        assert data["uss"] <= data["rss"]
+
+
+@pytest.mark.asyncio
+async def test_search_summaries_by_keyword(client: AsyncClient, db_session: AsyncSession):
+    """Test exact and prefix keyword search with cursor pagination"""
+    await crud_summary.upsert_multi(db_session, objs_in=[
+        SummaryCreate(url="https://example.com/art", summary="s", key_top="Art", keywords="painting, history"),
+        SummaryCreate(url="https://example.com/party", summary="s", key_top="party", keywords="music"),
+        SummaryCreate(url="https://example.com/artists", summary="s", key_top="music", keywords="artists"),
+    ])
+
+    response = await client.get("/api/v1/summaries/keyword/art/")
+    assert response.status_code == 200
+    assert [s["url"] for s in response.json()] == ["https://example.com/art"]
+
+    response = await client.get("/api/v1/summaries/keyword/art/", params={"prefix": True, "limit": 1})
+    assert [s["url"] for s in response.json()] == ["https://example.com/art"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get("/api/v1/summaries/keyword/art/",
+                                params={"prefix": True, "limit": 1, "cursor": cursor})
+    assert [s["url"] for s in response.json()] == ["https://example.com/artists"]
+
+    summary = await crud_summary.get_by_url(db_session, url="https://example.com/party")
+    await crud_summary.update(db_session, db_obj=summary, obj_in=SummaryUpdate(keywords="art"))
+    response = await client.get("/api/v1/summaries/keyword/ART/")
+    assert [s["url"] for s in response.json()] == ["https://example.com/art", "https://example.com/party"]
+
+    response = await client.get("/api/v1/summaries/keyword/history/")
+    await client.delete(f"/api/v1/summaries/{response.json()[0]['id']}/")
+    response = await client.get("/api/v1/summaries/keyword/history/")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_search_summaries(client: AsyncClient, db_session: AsyncSession):
+    """Test full-text search ranking and index updates"""
+    await crud_summary.upsert_multi(db_session, objs_in=[
+        SummaryCreate(url="https://example.com/markets", summary="Stock markets fell. Markets fear inflation."),
+        SummaryCreate(url="https://example.com/science", summary="A new telescope was launched."),
+        SummaryCreate(url="https://news.org/economy", summary="Inflation eased while stock markets rallied."),
+    ])
+
+    response = await client.get("/api/v1/summaries/search/", params={"q": "markets"})
+    assert response.status_code == 200
+    assert [s["url"] for s in response.json()] == ["https://example.com/markets", "https://news.org/economy"]
+
+    response = await client.get("/api/v1/summaries/search/", params={"q": "org"})
+    assert [s["url"] for s in response.json()] == ["https://news.org/economy"]
+
+    summary = await crud_summary.get_by_url(db_session, url="https://example.com/science")
+    await crud_summary.update(db_session, db_obj=summary, obj_in=SummaryUpdate(summary="Telescope markets."))
+    response = await client.get("/api/v1/summaries/search/", params={"q": "telescope market"})
+    assert [s["url"] for s in response.json()] == ["https://example.com/science"]
+
+    response = await client.get("/api/v1/summaries/search/", params={"q": "launched"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_all_summaries_cursor_and_fields(client: AsyncClient, db_session: AsyncSession):
+    """Test keyset pagination and field selection of the summary list"""
+    await crud_summary.upsert_multi(db_session, objs_in=[
+        SummaryCreate(url=f"https://example{i}.com", summary=f"Test summary {i}", key_top="news")
+        for i in range(5)
+    ])
+
+    response = await client.get("/api/v1/summaries/", params={"limit": 2, "fields": "url,key_top"})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"url": "https://example0.com/", "key_top": "news"},
+        {"url": "https://example1.com/", "key_top": "news"},
+    ]
+    # The deprecated offset keeps working
+    response = await client.get("/api/v1/summaries/", params={"skip": 3, "fields": "url"})
+    assert response.json() == [{"url": "https://example3.com/"}, {"url": "https://example4.com/"}]
+
+    urls = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "fields": "id,url", "order": "desc"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/summaries/", params=params)
+        urls += [s["url"] for s in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert urls == [f"https://example{i}.com/" for i in reversed(range(5))]
+
+    response = await client.get("/api/v1/summaries/", params={"fields": "url,secret"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_summary_deduplicates_urls(client: AsyncClient, session_factory):
+    """Test that concurrent submits of equivalent URLs share one summary"""
+    async def submit(url):
+        async with session_factory() as db:
+            summary, created = await crud_summary.get_or_create(db, obj_in=SummaryCreate(url=url))
+            return summary.id, created
+
+    results = await asyncio.gather(*[
+        submit(url) for url in ["https://Example.com:443/a?x=1&y=2", "https://example.com/a?y=2&x=1#top"] * 3
+    ])
+    assert len({summary_id for summary_id, _ in results}) == 1
+    assert sum(created for _, created in results) == 1
+    # A trailing slash may name another resource, except for the root path
+    assert (await submit("https://example.com/a/?x=1&y=2"))[1]
+    assert (await submit("https://example.com"))[0] == (await submit("https://example.com/"))[0]
+
+    response = await client.post("/api/v1/summaries/", json={"url": "https://EXAMPLE.com/a?x=1&y=2"})
+    assert response.status_code == 201
+    assert response.json()["id"] == results[0][0]
+
+    other = await client.post("/api/v1/summaries/", json={"url": "https://example.com/b"})
+    response = await client.put(f"/api/v1/summaries/{other.json()['id']}/", json={"url": "https://example.com/a?x=1&y=2"})
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_summary_algorithm_selection(client: AsyncClient, db_session: AsyncSession, job_workers, monkeypatch):
+    """Test per-request algorithm and length selection for text and URL summaries"""
+    response = await client.get("/api/v1/summaries/algorithms")
+    assert response.status_code == 200
+    algorithms = {engine["name"]: engine for engine in response.json()}
+    assert {"auto", "frequency", "tfidf", "textrank", "lsa", "abstractive"} <= set(algorithms)
+    assert algorithms["frequency"]["cost"] == "low"
+
+    text = ("The central bank raised interest rates again this week. Markets reacted calmly to the bank decision. "
+            "It rained in the afternoon. The bank governor said rates could rise again. "
+            "A local team won the football match.")
+    for algorithm in ("frequency", "tfidf", "textrank", "lsa"):
+        response = await client.post("/api/v1/summaries/text", json={"text": text, "algorithm": algorithm, "n_sents": 2})
+        assert response.status_code == 201, algorithm
+        # LSA needs the NLTK tokenizer data, without it the summary comes from its lead fallback
+        assert response.json()["tier"] in (algorithm, "lead" if algorithm == "lsa" else algorithm)
+        summary = response.json()["summary"]
+        assert 0 < len(summary) < len(text), algorithm
+
+    response = await client.post("/api/v1/summaries/text", json={"text": text, "algorithm": "magic"})
+    assert response.status_code == 422
+    response = await client.post("/api/v1/summaries/text", json={"text": text, "algorithm": "lsa", "abstractive": True})
+    assert response.status_code == 422
+
+    options = []
+
+    async def fake_generate_summary_content(url, **kwargs):
+        options.append(kwargs)
+        return SummaryUpdate(summary="Summary", key_top="", keywords="")
+
+    monkeypatch.setattr(job_queue_module, "generate_summary_content", fake_generate_summary_content)
+    response = await client.post("/api/v1/summaries/", json={"url": "https://example.com/x", "algorithm": "lsa", "n_sents": 3})
+    assert response.status_code == 201
+    await wait_until(lambda: options)
+    assert options == [{"n_sents": 3, "algorithm": "lsa"}]
+
+    # A recent summary is reused only for the options it was generated with
+    response = await client.post("/api/v1/summaries/", json={"url": "https://example.com/x", "algorithm": "lsa", "n_sents": 3})
+    assert response.status_code == 201
+    assert (response.json()["algorithm"], response.json()["n_sents"]) == ("lsa", 3)
+    response = await client.post("/api/v1/summaries/", json={"url": "https://example.com/x", "algorithm": "lsa", "n_sents": 2})
+    assert response.status_code == 201
+    await wait_until(lambda: len(options) > 1)
+    assert options == [{"n_sents": 3, "algorithm": "lsa"}, {"n_sents": 2, "algorithm": "lsa"}]
+
+
+@pytest.mark.asyncio
+async def test_create_summary_from_text_latency_budget(client: AsyncClient, monkeypatch):
+    """Test that a text summary falls back to the lead sentences when the budget runs out"""
+    text = "Rates rose again this week. Markets reacted calmly. It rained in the afternoon."
+    response = await client.post("/api/v1/summaries/text", json={"text": text, "algorithm": "tfidf"})
+    assert response.json()["tier"] == "tfidf"
+
+    async def slow_run(fn, *args, **kwargs):
+        await asyncio.sleep(0.5)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(summarizer_pool, "run", slow_run)
+    start = asyncio.get_running_loop().time()
+    response = await client.post("/api/v1/summaries/text",
+                                 json={"text": text, "algorithm": "textrank", "n_sents": 1, "budget_ms": 100})
+    assert asyncio.get_running_loop().time() - start < 0.4
+    assert response.status_code == 201
+    assert response.json()["tier"] == "lead"
+    assert response.json()["summary"] == "Rates rose again this week."
+
+    # The job left running past the budget finishes before the test's event loop closes
+    assert latency_budget.orphans == 1
+    await asyncio.wait(set(latency_budget._orphans))
+    assert latency_budget.orphans == 0
@@ -0,0 +1,308 @@
+import os
+import sys
+import asyncio
+import time
+import subprocess
+import threading
+
+import pytest
+
+from app.core import summarizer
+from app.core.keyword_batcher import KeywordBatcher
+from app.core.summary_cache import SummaryCache, make_cache_key
+
+
+LONG_TEXT = (
+    "The central bank raised interest rates again this week. "
+    "Markets reacted nervously to the announcement from the central bank. "
+    "Analysts expect inflation to slow down in the coming months. "
+    "The weather in the capital was sunny and warm on Tuesday. "
+    "Several banks announced higher rates for savings accounts. "
+    "Investors moved money from stocks into government bonds. "
+    "A local football team won its third match in a row. "
+    "The central bank governor defended the decision on rates and inflation."
+)
+
+
+def test_extractive_summary_spacy_parses_document_once(monkeypatch):
+    """Test that the spaCy summarizer runs the pipeline a single time per document"""
+    if summarizer.get_nlp() is None:
+        pytest.skip("spaCy model not available")
+
+    calls = []
+    real_nlp = summarizer.get_nlp()
+
+    def counting_nlp(text, *args, **kwargs):
+        calls.append(text)
+        return real_nlp(text, *args, **kwargs)
+
+    monkeypatch.setattr(summarizer, "nlp", counting_nlp)
+    summary = summarizer.extractive_summary_spacy(LONG_TEXT, n_sents=3)
+
+    assert len(calls) == 1
+    assert "central bank" in summary
+
+
+def test_generate_keywords_reuses_classifier(monkeypatch):
+    """Test that the zero-shot classifier is built once and reused until unloaded"""
+    built = []
+
+    def fake_pipeline(task, model):
+        built.append(model)
+
+        def classify(sequences, labels, multi_label=False):
+            return {"labels": list(labels), "scores": [0.9] * len(labels)}
+        return classify
+
+    monkeypatch.setattr(summarizer, "pipeline", fake_pipeline)
+    summarizer.unload_models()
+
+    assert summarizer.generate_keywords("A summary about markets.") == summarizer.CANDIDATE_LABELS[:5]
+    summarizer.generate_keywords("Another summary about science.")
+    assert len(built) == 1
+
+    summarizer.unload_models()
+    summarizer.generate_keywords("A third summary.")
+    assert len(built) == 2
+    summarizer.unload_models()
+
+
+@pytest.mark.asyncio
+async def test_keyword_batcher_classifies_concurrent_summaries_together(monkeypatch):
+    """Test that concurrent keyword requests are classified in a single batch, in the classifier pool"""
+    batches = []
+    threads = []
+
+    def fake_pipeline(task, model):
+        def classify(sequences, labels, multi_label=False, batch_size=None):
+            if isinstance(sequences, str):
+                return {"labels": list(labels), "scores": [0.9] * len(labels)}
+            batches.append(list(sequences))
+            threads.append(threading.current_thread().name)
+            return [{"labels": [seq.split()[0]], "scores": [0.9]} for seq in sequences]
+        return classify
+
+    monkeypatch.setattr(summarizer, "pipeline", fake_pipeline)
+    summarizer.unload_models()
+
+    batcher = KeywordBatcher(max_batch_size=8, max_wait=0.01)
+    results = await asyncio.gather(
+        batcher.classify("finance news"),
+        batcher.classify("science news"),
+        batcher.classify(""),
+    )
+
+    assert results == [["finance"], ["science"], []]
+    assert batches == [["finance news", "science news"]]
+    assert threads[0].startswith("classifier")
+    summarizer.unload_models()
+
+
+@pytest.mark.asyncio
+async def test_keyword_batcher_unloads_idle_classifier(monkeypatch):
+    """Test that the classifier is unloaded from the classifier pool once no batch came for a while"""
+    built = []
+
+    def fake_pipeline(task, model):
+        built.append(model)
+
+        def classify(sequences, labels, multi_label=False, batch_size=None):
+            if isinstance(sequences, str):
+                return {"labels": list(labels), "scores": [0.9] * len(labels)}
+            return [{"labels": [seq.split()[0]], "scores": [0.9]} for seq in sequences]
+        return classify
+
+    monkeypatch.setattr(summarizer, "pipeline", fake_pipeline)
+    summarizer.unload_models()
+
+    batcher = KeywordBatcher(max_batch_size=8, max_wait=0.01, idle_unload=0.1)
+    assert await batcher.classify("finance news") == ["finance"]
+    await asyncio.sleep(0.05)
+    assert await batcher.classify("science news") == ["science"]
+    assert summarizer.load_classifier.cache_info().currsize == 1
+
+    await asyncio.sleep(0.3)
+    assert summarizer.load_classifier.cache_info().currsize == 0
+    assert await batcher.classify("sports news") == ["sports"]
+    assert len(built) == 2
+    summarizer.unload_models()
+
+
+def test_summary_cache_shares_entries_across_layers(tmp_path, monkeypatch):
+    """Test that identical content hits the cache from memory and from disk"""
+    db_path = str(tmp_path / "cache.db")
+    cache = SummaryCache(max_size=2, db_path=db_path, ttl=60)
+    monkeypatch.setattr(summarizer, "summary_cache", cache)
+    calls = []
+    monkeypatch.setattr(summarizer, "get_nlp", lambda: None)
+    monkeypatch.setattr(summarizer, "extractive_summary_lsa",
+                        lambda text, n_sents=5: calls.append(text) or "cached summary")
+
+    assert summarizer.generate_summary_from_text(LONG_TEXT) == ("cached summary", "lsa")
+    assert summarizer.generate_summary_from_text("  " + LONG_TEXT.replace(" ", "\n")) == ("cached summary", "lsa")
+    assert len(calls) == 1
+
+    # A fresh process only sees the disk layer
+    monkeypatch.setattr(summarizer, "summary_cache", SummaryCache(db_path=db_path, ttl=60))
+    assert summarizer.generate_summary_from_text(LONG_TEXT) == ("cached summary", "lsa")
+    assert len(calls) == 1
+
+    # Different parameters are cached separately
+    summarizer.generate_summary_from_text(LONG_TEXT, n_sents=3)
+    assert len(calls) == 2
+
+    assert make_cache_key(LONG_TEXT, 5, "lsa") != make_cache_key(LONG_TEXT, 5, "spacy")
+
+
+def test_fallback_summaries_are_not_cached_for_the_failed_algorithm(monkeypatch):
+    """Test that a failed engine hands over to its fallback without caching its output as its own"""
+    monkeypatch.setattr(summarizer, "summary_cache", SummaryCache())
+    monkeypatch.setattr(summarizer, "get_nlp", lambda: None)
+
+    def failing_lsa(text, n_sents=5):
+        raise RuntimeError("LSA failed")
+
+    monkeypatch.setattr(summarizer, "extractive_summary_lsa", failing_lsa)
+    assert summarizer.generate_summary_from_text(LONG_TEXT, n_sents=2) == (summarizer.lead_summary(LONG_TEXT, 2), "lead")
+
+    monkeypatch.setattr(summarizer, "extractive_summary_lsa", lambda text, n_sents=5: "LSA summary")
+    assert summarizer.generate_summary_from_text(LONG_TEXT, n_sents=2) == ("LSA summary", "lsa")
+
+
+class WhitespaceTokenizer:
+    """Tokenizer stand-in counting one token per word and two special tokens"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts, add_special_tokens=True, **kwargs):
+        self.calls += 1
+        return {"input_ids": [text.split() for text in texts]}
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+
+def test_get_nest_sentences_chunks_by_token_count(monkeypatch):
+    """Test that chunks respect the token budget and tokenization happens in one batch"""
+    monkeypatch.setattr(summarizer, "nlp", None)
+    document = "one two three. four five. six seven eight nine. ten. eleven twelve"
+    tokenizer = WhitespaceTokenizer()
+
+    chunks = summarizer.get_nest_sentences(document, tokenizer, token_max_length=7)
+
+    assert chunks == ["one two three four five", "six seven eight nine ten", "eleven twelve"]
+    assert tokenizer.calls == 1
+
+    chunks = summarizer.get_nest_sentences(document, tokenizer, token_max_length=7, overlap_tokens=2)
+
+    assert chunks == ["one two three four five", "six seven eight nine ten", "ten eleven twelve"]
+
+
+def test_abstractive_summary_reduces_chunk_summaries(monkeypatch):
+    """Test that chunk summaries are summarized again until they fit in one chunk"""
+    monkeypatch.setattr(summarizer, "nlp", None)
+    monkeypatch.setattr(summarizer.settings, "abstractive_chunk_tokens", 8)
+    calls = []
+
+    def fake_model(chunks, **kwargs):
+        calls.append(list(chunks))
+        # Keep the first two words of every chunk as its "summary"
+        return [{"summary_text": " ".join(chunk.split()[:2]) + "."} for chunk in chunks]
+
+    monkeypatch.setattr(summarizer, "load_summarization_pipeline", lambda model: fake_model)
+    monkeypatch.setattr(summarizer, "load_tokenizer", lambda model: WhitespaceTokenizer())
+    document = ". ".join(f"w{i}a w{i}b w{i}c w{i}d w{i}e" for i in range(6))
+
+    summary = summarizer.abstractive_summary_pipeline(document)
+
+    assert len(calls[0]) == 6
+    assert len(calls) == 3
+    assert len(calls[-1]) == 1
+    assert summary == "w0a w0b."
+
+
+def test_generate_summaries_from_texts_pipes_documents_in_order(monkeypatch):
+    """Test that batch summarization parses all texts with nlp.pipe and keeps the input order"""
+    spacy = pytest.importorskip("spacy")
+    blank = spacy.blank("en")
+    blank.add_pipe("sentencizer")
+
+    class PipeOnlyNlp:
+        def __init__(self):
+            self.piped = []
+
+        def __call__(self, text):
+            raise AssertionError("texts must go through nlp.pipe")
+
+        def pipe(self, texts, batch_size, n_process):
+            texts = list(texts)
+            self.piped.append(texts)
+            return blank.pipe(texts, batch_size=batch_size)
+
+    fake_nlp = PipeOnlyNlp()
+    monkeypatch.setattr(summarizer, "nlp", fake_nlp)
+    monkeypatch.setattr(summarizer, "summary_cache", SummaryCache())
+    texts = [f"Document number {i} talks about topic {i}. It has a second sentence too." for i in range(5)]
+
+    summaries = summarizer.generate_summaries_from_texts(texts, n_sents=1)
+
+    assert len(fake_nlp.piped) == 1
+    assert [summary.split()[2] for summary in summaries] == ["0", "1", "2", "3", "4"]
+
+    # Cached documents are not parsed again
+    summarizer.generate_summaries_from_texts(texts[:2] + ["A brand new document about something else."], n_sents=1)
+    assert fake_nlp.piped[1] == ["A brand new document about something else."]
+
+
+def test_import_does_not_load_models():
+    """Test that importing the app leaves the heavy NLP libraries unloaded"""
+    code = (
+        "import sys, app.main; "
+        "print([m for m in ('spacy', 'transformers', 'torch', 'nltk', 'newspaper', 'sumy') if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_preload_models_freezes_loaded_objects(monkeypatch):
+    """Test that preloading warms the models up before freezing the heap"""
+    calls = []
+    monkeypatch.setattr(summarizer, "warm_up", lambda classifier=False: calls.append("warm_up"))
+    monkeypatch.setattr(summarizer.gc, "freeze", lambda: calls.append("freeze"))
+
+    summarizer.preload_models()
+    assert calls == ["warm_up", "freeze"]
+
+
+def test_generate_summary_within_budget_degrades(monkeypatch):
+    """Test that engines not expected to finish in time are skipped for faster ones"""
+    text = ("The central bank raised interest rates again this week. Markets reacted calmly to the bank decision. "
+            "It rained in the afternoon. The bank governor said rates could rise again.")
+    monkeypatch.setattr(summarizer, "summary_cache", SummaryCache())
+    speeds = {"textrank": 1e-3}
+
+    summary, tier, seconds = summarizer.generate_summary_within_budget(text, 2, "textrank", time.time() + 5, speeds)
+    assert tier in [engine.name for engine in summarizer.degradation_ladder("textrank", speeds)[1:]]
+    assert summary and seconds is not None
+
+    # Out of time and nothing cached for this length: only the last resort runs
+    summary, tier, _ = summarizer.generate_summary_within_budget(text, 1, "textrank", time.time() - 1, speeds)
+    assert tier == "lead"
+    assert summary == "The central bank raised interest rates again this week."
+
+
+def test_generate_summary_within_budget_skips_failing_tier(monkeypatch):
+    """Test that a failing engine is not reported, cached or timed as the tier that ran"""
+    monkeypatch.setattr(summarizer, "summary_cache", SummaryCache())
+
+    def failing_abstractive(text, n_sents=5):
+        raise RuntimeError("Model not available")
+
+    monkeypatch.setattr(summarizer, "abstractive_summary_pipeline", failing_abstractive)
+    abstractive = summarizer.get_engine("abstractive")
+
+    summary, tier, _ = summarizer.generate_summary_within_budget(LONG_TEXT, 2, "abstractive")
+    assert summary and tier != "abstractive"
+    assert summarizer.summary_cache.get(summarizer.summary_cache_key(LONG_TEXT, 2, abstractive)) is None